@@ -0,0 +1,62 @@
+"""Mesure le débit du serveur HTTP de transcription avec le reconnaisseur hors ligne.
+
+Usage : python benchmarks/api_throughput.py --requests 8 --duration 180 --latency-ratio 0.02
+"""
+import os
+import sys
+import io
+import time
+import wave
+import asyncio
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api_client import parse_events, post_chunked
+from src.api_server import TranscriptionServer
+from src.recognizers import OfflineRecognizer
+
+
+def make_wav(seconds, rate=8000):
+    """WAV mono 16 bits de bruit aléatoire"""
+    samples = np.random.default_rng(0).integers(-3000, 3000, seconds * rate, dtype=np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(samples.astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+async def run(args):
+    backend = OfflineRecognizer(latency_ratio=args.latency_ratio)
+    server = await TranscriptionServer(port=0, max_workers=args.workers, recognize_backend=backend).start()
+    payload = make_wav(args.duration)
+    try:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(post_chunked(server.port, '/transcribe', payload)
+                                           for _ in range(args.requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await server.stop()
+    segments = sum(len(parse_events(r)[1]) - 1 for r in responses)
+    audio_seconds = args.requests * args.duration
+    print(f"{args.requests} requêtes, {segments} segments en {elapsed:.2f}s")
+    print(f"Débit : {segments / elapsed:.1f} segments/s, {audio_seconds / elapsed:.1f}x temps réel")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=8)
+    parser.add_argument('--duration', type=int, default=180, help="Durée de chaque fichier (s)")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency-ratio', type=float, default=0.02,
+                        help="Latence simulée par seconde d'audio")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Rejoue des réponses de reconnaissance enregistrées pour comparer les ordonnancements.
+
+Les latences proviennent d'un enregistrement (`audio2text-cli worker --record`) ou du
+journal de l'application ; aucun appel réseau n'est effectué.
+
+Usage : python benchmarks/replay_schedule.py --log audio2text.log --workers 13 --speed 10
+        python benchmarks/replay_schedule.py --recording run.jsonl --audio fichier.mp3
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.audio_converter as audio_converter
+from src.audio_converter import AudioConverter
+from src.replay import Recording, ReplayBackend
+
+
+class WavCopyConverter(AudioConverter):
+    """Le fichier synthétique est déjà en WAV : copie au lieu d'un passage par ffmpeg"""
+
+    def convert_to_wav(self, audio_path, scratch=None):
+        path = (scratch or self.scratch).new_file('.wav')
+        shutil.copyfile(audio_path, path)
+        return path
+
+
+def run_once(args, recording, audio_path, segment_duration, schedule):
+    backend = ReplayBackend(recording, speed=args.speed)
+    factory = WavCopyConverter if args.audio is None else AudioConverter
+    converter = factory(max_workers=args.workers, recognize_backend=backend)
+    if segment_duration:
+        converter.segment_duration = segment_duration
+    original = audio_converter.schedule_segments
+    if schedule == 'fifo':
+        audio_converter.schedule_segments = lambda segments: list(segments)
+    try:
+        converter.convert_to_text(audio_path)
+    finally:
+        audio_converter.schedule_segments = original
+    stats = converter.job_stats
+    print(f"{schedule:5s} : {stats['total_seconds'] * args.speed:6.1f}s, traîne "
+          f"{stats['tail_seconds'] * args.speed:5.1f}s (temps enregistré), "
+          f"{backend.hits} segments retrouvés, {backend.misses} estimés")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--recording', help="Enregistrement JSON lines")
+    source.add_argument('--log', help="Journal de l'application (audio2text.log)")
+    parser.add_argument('--audio', help="Fichier audio d'origine de l'enregistrement")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--speed', type=float, default=10.0, help="Accélération du rejeu")
+    parser.add_argument('--schedule', choices=['lpt', 'fifo', 'both'], default='both')
+    args = parser.parse_args()
+
+    recording = Recording.load(args.recording) if args.recording else Recording.from_log(args.log)
+    segment_duration = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        audio_path = args.audio
+        if audio_path is None:
+            segments = recording.meta['synthetic']['segments']
+            segment_duration = segments[0][1] - segments[0][0]
+            audio_path = os.path.join(tmp_dir, 'synthetique.wav')
+            recording.synthetic_audio().to_audio_segment().export(audio_path, format='wav')
+        for schedule in (['lpt', 'fifo'] if args.schedule == 'both' else [args.schedule]):
+            run_once(args, recording, audio_path, segment_duration, schedule)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,10 +9,13 @@ setup(
         'pydub>=0.25.1',
         'SpeechRecognition>=3.10.0',
         'python-docx>=0.8.11',
+        'numpy>=1.21.0',
     ],
     entry_points={
         'console_scripts': [
             'audio2text=src.main:main',
+            'audio2text-cli=src.cli:main',
+            'audio2text-server=src.api_server:main',
         ],
     },
     author="Liv",
@@ -0,0 +1,37 @@
+import json
+import asyncio
+
+
+async def post_chunked(port, path, payload, chunk_size=16 * 1024, host='127.0.0.1'):
+    """Envoie `payload` en Transfer-Encoding: chunked et retourne la réponse brute complète"""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                 f"Transfer-Encoding: chunked\r\n\r\n".encode('ascii'))
+    for i in range(0, len(payload), chunk_size):
+        chunk = payload[i:i + chunk_size]
+        writer.write(f"{len(chunk):X}\r\n".encode('ascii') + chunk + b"\r\n")
+        await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+def parse_events(response):
+    """Sépare une réponse server-sent events en (en-têtes, [(événement, données)])"""
+    head, _, body = response.partition(b"\r\n\r\n")
+    # Décoder le corps chunked
+    data = b''
+    while body:
+        size_line, _, body = body.partition(b"\r\n")
+        size = int(size_line, 16)
+        if size == 0:
+            break
+        data += body[:size]
+        body = body[size + 2:]
+    events = []
+    for block in data.decode('utf-8').strip().split("\n\n"):
+        lines = dict(line.split(': ', 1) for line in block.split("\n"))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return head, events
@@ -0,0 +1,392 @@
+import os
+import sys
+import json
+import struct
+import asyncio
+import argparse
+import logging
+from urllib.parse import urlsplit, parse_qs
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_converter import AudioConverter, find_ffmpeg
+from src.languages import AUTO_LANGUAGE
+from src.pcm_buffer import PCMBuffer
+from src.worker_pool import default_worker_count, get_shared_executor
+
+READ_CHUNK_SIZE = 64 * 1024
+MAX_HEADER_SIZE = 64 * 1024
+
+# Format PCM produit par ffmpeg pour les uploads qui ne sont pas du WAV
+FFMPEG_RATE = 44100
+FFMPEG_CHANNELS = 1
+FFMPEG_SAMPLE_WIDTH = 2
+
+
+class HTTPError(Exception):
+    """Erreur HTTP renvoyée au client avec un code de statut"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           411: 'Length Required', 500: 'Internal Server Error'}
+
+
+class BodyReader:
+    """Lit le corps d'une requête par morceaux (Content-Length ou Transfer-Encoding: chunked)"""
+
+    def __init__(self, reader: asyncio.StreamReader, headers):
+        self._reader = reader
+        self._chunked = 'chunked' in headers.get('transfer-encoding', '').lower()
+        if not self._chunked and 'content-length' not in headers:
+            raise HTTPError(411, "Content-Length ou Transfer-Encoding: chunked requis")
+        self._remaining = 0 if self._chunked else int(headers['content-length'])
+        self._eof = False
+        self._pending = b''
+
+    async def _read_some(self):
+        """Retourne le prochain morceau disponible du corps (b'' en fin de corps)"""
+        if self._eof:
+            return b''
+        if self._chunked and self._remaining == 0:
+            size_line = await self._reader.readline()
+            size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+            if size == 0:
+                # Ignorer les trailers éventuels
+                while (await self._reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                self._eof = True
+                return b''
+            self._remaining = size
+        if self._remaining == 0:
+            self._eof = True
+            return b''
+        data = await self._reader.read(min(self._remaining, READ_CHUNK_SIZE))
+        if not data:
+            raise HTTPError(400, "Corps de requête tronqué")
+        self._remaining -= len(data)
+        if self._chunked and self._remaining == 0:
+            await self._reader.readexactly(2)  # CRLF de fin de morceau
+        return data
+
+    async def read(self, n=-1):
+        """Lit jusqu'à n octets (n=-1 : le prochain morceau disponible)"""
+        if self._pending:
+            data = self._pending if n < 0 else self._pending[:n]
+            self._pending = self._pending[len(data):]
+            return data
+        data = await self._read_some()
+        if 0 <= n < len(data):
+            self._pending = data[n:]
+            data = data[:n]
+        return data
+
+    async def readexactly(self, n):
+        parts = []
+        while n > 0:
+            data = await self.read(n)
+            if not data:
+                raise HTTPError(400, "Fichier WAV tronqué")
+            parts.append(data)
+            n -= len(data)
+        return b''.join(parts)
+
+    def unread(self, data):
+        self._pending = data + self._pending
+
+
+async def read_wav_header(body: BodyReader):
+    """Analyse l'en-tête WAV au fil de l'eau ; retourne (channels, rate, width, data_size)"""
+    riff = await body.readexactly(12)
+    if riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+        raise HTTPError(400, "En-tête WAV invalide")
+    fmt = None
+    while True:
+        chunk_id, size = struct.unpack('<4sI', await body.readexactly(8))
+        if chunk_id == b'fmt ':
+            data = await body.readexactly(size + (size & 1))
+            audio_format, channels, rate, _, _, bits = struct.unpack('<HHIIHH', data[:16])
+            if audio_format not in (1, 0xFFFE) or bits % 8:
+                raise HTTPError(400, "Seul le WAV PCM est supporté")
+            fmt = (channels, rate, bits // 8)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise HTTPError(400, "Bloc fmt manquant avant les données")
+            # 0 / 0xFFFFFFFF : taille inconnue (flux), lire jusqu'à la fin du corps
+            return fmt + (None if size in (0, 0xFFFFFFFF) else size,)
+        else:
+            await body.readexactly(size + (size & 1))
+
+
+class TranscriptionServer:
+    """Serveur HTTP asyncio local : upload audio en flux, résultats par segment en SSE"""
+
+    def __init__(self, host='127.0.0.1', port=8765, max_workers=None, recognize_backend=None,
+                 max_in_flight=None):
+        self.host = host
+        self.port = port
+        self.recognize_backend = recognize_backend
+        # Segments d'une requête en attente de résultat : au-delà, la lecture de l'upload est suspendue
+        self.max_in_flight = max_in_flight or max_workers or default_worker_count()
+        # Pool partagé du processus, agrandi si une taille supérieure est demandée
+        self.executor = get_shared_executor(max_workers)
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"Serveur de transcription démarré sur http://{self.host}:{self.port}")
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        logging.info("Serveur de transcription arrêté")
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            size = len(request_line)
+            while True:
+                line = await reader.readline()
+                size += len(line)
+                if size > MAX_HEADER_SIZE:
+                    raise HTTPError(400, "En-têtes trop volumineux")
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            url = urlsplit(target)
+            if url.path == '/health':
+                await self._send_simple(writer, 200, 'ok')
+            elif url.path == '/transcribe':
+                if method != 'POST':
+                    raise HTTPError(405, "Utiliser POST")
+                query = parse_qs(url.query)
+                language = query.get('language', ['fr-FR'])[0]
+                if language == AUTO_LANGUAGE:
+                    # Les segments partent avant la fin de l'upload : pas de passe de détection préalable
+                    raise HTTPError(400, "Détection automatique de la langue non disponible en flux")
+                await self._transcribe(BodyReader(reader, headers), headers, language, writer)
+            else:
+                raise HTTPError(404, "Ressource introuvable")
+        except HTTPError as e:
+            await self._send_simple(writer, e.status, e.message)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            logging.warning("Connexion client interrompue")
+        except Exception as e:
+            logging.error(f"Erreur du serveur de transcription : {str(e)}", exc_info=True)
+            await self._send_simple(writer, 500, str(e))
+        finally:
+            writer.close()
+
+    async def _send_simple(self, writer, status, message):
+        body = message.encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                     f"Content-Type: text/plain; charset=utf-8\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1') + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _pcm_source(self, body, headers):
+        """Générateur asynchrone (format, blocs PCM) : WAV lu directement, autres formats via ffmpeg"""
+        head = await body.read(4)
+        body.unread(head)
+        if head == b'RIFF':
+            channels, rate, width, data_size = await read_wav_header(body)
+            yield (channels, rate, width)
+            remaining = data_size
+            while remaining is None or remaining > 0:
+                data = await body.read(READ_CHUNK_SIZE if remaining is None else min(remaining, READ_CHUNK_SIZE))
+                if not data:
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+                yield data
+            return
+
+        ffmpeg_cmd = find_ffmpeg()
+        process = await asyncio.create_subprocess_exec(
+            ffmpeg_cmd, '-i', 'pipe:0', '-f', 's16le', '-acodec', 'pcm_s16le',
+            '-ac', str(FFMPEG_CHANNELS), '-ar', str(FFMPEG_RATE), 'pipe:1',
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+
+        async def feed():
+            try:
+                while True:
+                    data = await body.read()
+                    if not data:
+                        break
+                    process.stdin.write(data)
+                    await process.stdin.drain()
+            finally:
+                process.stdin.close()
+
+        feeder = asyncio.ensure_future(feed())
+        try:
+            yield (FFMPEG_CHANNELS, FFMPEG_RATE, FFMPEG_SAMPLE_WIDTH)
+            while True:
+                data = await process.stdout.read(READ_CHUNK_SIZE)
+                if not data:
+                    break
+                yield data
+            await feeder
+            if await process.wait() != 0:
+                raise HTTPError(400, "Format audio non décodable par ffmpeg")
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    async def _transcribe(self, body, headers, language, writer):
+        """Découpe l'audio pendant l'upload et renvoie chaque segment dès qu'il est transcrit"""
+        converter = AudioConverter(max_workers=1, recognize_backend=self.recognize_backend)
+        source = self._pcm_source(body, headers)
+        channels, rate, width = await source.__anext__()
+        frame_size = channels * width
+        segment_bytes = int(converter.segment_duration * rate) * frame_size
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n"
+                     b"Cache-Control: no-cache\r\nTransfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+
+        async def send_event(event, payload):
+            data = f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode('utf-8')
+            writer.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+            await writer.drain()
+
+        pending = set()
+        results = {}
+
+        def submit(pcm, index, offset_bytes):
+            segment = PCMBuffer.from_bytes(pcm, rate, channels, width)
+            start = offset_bytes / (frame_size * rate)
+            end = start + len(pcm) / (frame_size * rate)
+            converter.metrics.queue_depth.inc()
+            task = self.executor.submit(converter._run_segment, (segment, index, start, end), language)
+            future = asyncio.wrap_future(task)
+            future.task = task
+            future.segment_times = (start, end)
+            pending.add(future)
+
+        def cancel_pending():
+            """Retire du pool les segments pas encore démarrés (client parti ou flux en erreur)"""
+            for future in pending:
+                if future.task.cancel():
+                    converter.metrics.queue_depth.dec()
+                future.cancel()
+            pending.clear()
+
+        async def flush_done(block=False):
+            if not pending:
+                return
+            done, _ = await asyncio.wait(pending, timeout=None if block else 0,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                index, text = future.result()
+                results[index] = text
+                start, end = future.segment_times
+                await send_event('segment', {'index': index, 'start': round(start, 3),
+                                             'end': round(end, 3), 'text': text})
+
+        async def flush_all():
+            # Chaque résultat part dès qu'il arrive, y compris après la fin de l'upload
+            while pending:
+                await flush_done(block=True)
+
+        async def end_with_error(status, message):
+            # Les en-têtes sont déjà partis : l'erreur est un événement du flux, pas un statut HTTP
+            await send_event('error', {'status': status, 'message': message})
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+
+        buffer = bytearray()
+        offset = 0
+        index = 0
+        try:
+            async for data in source:
+                buffer.extend(data)
+                while len(buffer) >= segment_bytes:
+                    # Contre-pression : le corps n'est plus lu (et TCP ralentit le client)
+                    # tant que la reconnaissance a trop de segments en retard
+                    while len(pending) >= self.max_in_flight:
+                        await flush_done(block=True)
+                    index += 1
+                    submit(bytes(buffer[:segment_bytes]), index, offset)
+                    del buffer[:segment_bytes]
+                    offset += segment_bytes
+                await flush_done()
+            usable = len(buffer) - len(buffer) % frame_size
+            if usable:
+                index += 1
+                submit(bytes(buffer[:usable]), index, offset)
+            await flush_all()
+            text = converter.format_text(" ".join(results[i] for i in sorted(results) if results[i]))
+            await send_event('done', {'segments': index, 'text': text})
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except HTTPError as e:
+            await flush_all()
+            await end_with_error(e.status, e.message)
+            return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # Client déconnecté : inutile de reconnaître la suite de son audio
+            cancel_pending()
+            raise
+        except Exception as e:
+            logging.error(f"Erreur du serveur de transcription : {str(e)}", exc_info=True)
+            cancel_pending()
+            await end_with_error(500, str(e))
+            return
+        logging.info(f"Transcription HTTP terminée : {index} segments")
+
+
+def main(argv=None):
+    """Lance le serveur HTTP de transcription"""
+    parser = argparse.ArgumentParser(prog='audio2text-server', description="API HTTP locale de transcription")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('-w', '--workers', type=int)
+    parser.add_argument('--offline', action='store_true', help="Utiliser le reconnaisseur factice hors ligne")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    backend = None
+    if args.offline:
+        from src.recognizers import OfflineRecognizer
+        backend = OfflineRecognizer()
+
+    async def run():
+        server = await TranscriptionServer(args.host, args.port, args.workers, backend).start()
+        try:
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import asyncio
+import inspect
+import logging
+from typing import AsyncIterator, NamedTuple, Optional
+
+import speech_recognition as sr
+
+from src.audio_converter import AudioConverter, find_ffmpeg
+from src.languages import AUTO_LANGUAGE
+from src.pcm_buffer import PCMBuffer
+from src.worker_pool import get_shared_executor
+
+# Format PCM demandé à ffmpeg
+PCM_RATE = 16000
+PCM_WIDTH = 2
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class SegmentResult(NamedTuple):
+    index: int
+    start: float
+    end: float
+    text: str
+
+
+def _is_async_backend(backend):
+    return inspect.iscoroutinefunction(backend) or inspect.iscoroutinefunction(getattr(backend, '__call__', None))
+
+
+async def ffmpeg_pcm(path: str, sample_rate: int = PCM_RATE) -> AsyncIterator[bytes]:
+    """Décode un fichier audio en PCM 16 bits mono avec un sous-processus ffmpeg asynchrone"""
+    process = await asyncio.create_subprocess_exec(
+        find_ffmpeg(), '-nostdin', '-v', 'error', '-i', path, '-f', 's16le', '-acodec', 'pcm_s16le',
+        '-ac', '1', '-ar', str(sample_rate), 'pipe:1',
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    stderr_task = asyncio.ensure_future(process.stderr.read())
+    try:
+        while True:
+            data = await process.stdout.read(READ_CHUNK_SIZE)
+            if not data:
+                break
+            yield data
+        stderr = await stderr_task
+        if await process.wait() != 0:
+            raise RuntimeError(f"Erreur ffmpeg: {stderr.decode('utf-8', 'replace')}")
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        stderr_task.cancel()
+
+
+async def _recognize_async(converter, pcm, sample_rate, index, language):
+    """Reconnaissance d'un segment : coroutine native si le backend l'est, sinon pool de threads"""
+    backend = converter.recognize_backend
+    if _is_async_backend(backend):
+        audio = sr.AudioData(pcm, sample_rate, PCM_WIDTH)
+        with converter.recognizer_pool.acquire() as recognizer:
+            try:
+                text = await backend(recognizer, audio, language)
+            except (sr.UnknownValueError, sr.RequestError) as e:
+                return converter.recognition_failed(e, index)
+        return converter.recognition_succeeded(text, index)
+    loop = asyncio.get_running_loop()
+    executor = converter.executor or get_shared_executor()
+    return await loop.run_in_executor(executor, converter.recognize_pcm, pcm, sample_rate, PCM_WIDTH,
+                                      index, language)
+
+
+async def transcribe_stream(chunks: AsyncIterator[bytes], sample_rate: int = PCM_RATE, channels: int = 1,
+                            language: str = 'fr-FR', converter: AudioConverter = None,
+                            semaphore: Optional[asyncio.Semaphore] = None,
+                            max_concurrency: int = None) -> AsyncIterator[SegmentResult]:
+    """Découpe un flux PCM 16 bits et produit chaque segment dès qu'il est transcrit.
+
+    Le sémaphore borne les segments en vol ; il peut être partagé entre plusieurs
+    transcriptions pour limiter la concurrence de tout un service. Le décodage
+    s'arrête tant qu'aucune place n'est libre. La langue doit être connue : les
+    segments partent avant la fin du flux, sans passe de détection préalable.
+    """
+    if language == AUTO_LANGUAGE:
+        raise ValueError("Détection automatique de la langue non disponible en flux : préciser la langue")
+    converter = converter or AudioConverter()
+    semaphore = semaphore or asyncio.Semaphore(max_concurrency or converter.max_workers)
+    frame_size = channels * PCM_WIDTH
+    segment_bytes = int(converter.segment_duration * sample_rate) * frame_size
+    results: asyncio.Queue = asyncio.Queue()
+    tasks = set()
+
+    async def recognize(index, pcm, start, end):
+        try:
+            if channels > 1:
+                pcm = PCMBuffer.from_bytes(pcm, sample_rate, channels).to_mono().raw_data
+            converter.metrics.active_workers.inc()
+            try:
+                text = await _recognize_async(converter, pcm, sample_rate, index, language)
+            finally:
+                converter.metrics.active_workers.dec()
+            await results.put(SegmentResult(index, start, end, text))
+        except Exception as e:
+            await results.put(e)
+
+    async def produce():
+        buffer = bytearray()
+        offset = 0
+        index = 0
+
+        async def submit(pcm):
+            nonlocal offset, index
+            await semaphore.acquire()
+            index += 1
+            start = offset / (frame_size * sample_rate)
+            offset += len(pcm)
+            end = offset / (frame_size * sample_rate)
+            task = asyncio.ensure_future(recognize(index, pcm, start, end))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            # Rendu à la fin de la tâche, y compris annulée avant d'avoir démarré
+            task.add_done_callback(lambda _: semaphore.release())
+
+        async for data in chunks:
+            buffer.extend(data)
+            while len(buffer) >= segment_bytes:
+                await submit(bytes(buffer[:segment_bytes]))
+                del buffer[:segment_bytes]
+        usable = len(buffer) - len(buffer) % frame_size
+        if usable:
+            await submit(bytes(buffer[:usable]))
+        return index
+
+    producer = asyncio.ensure_future(produce())
+    received = 0
+    try:
+        while True:
+            # Chaque segment soumis dépose exactement un résultat (ou une exception)
+            if producer.done() and received == producer.result():
+                break
+            getter = asyncio.ensure_future(results.get())
+            waiting = {getter} if producer.done() else {getter, producer}
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                continue
+            received += 1
+            item = getter.result()
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+        for task in list(tasks):
+            task.cancel()
+
+
+async def transcribe(path: str, language: str = 'fr-FR', converter: AudioConverter = None,
+                     semaphore: Optional[asyncio.Semaphore] = None,
+                     max_concurrency: int = None) -> AsyncIterator[SegmentResult]:
+    """Transcrit un fichier audio : `async for seg in transcribe(path)`"""
+    logging.info(f"Transcription asynchrone de {path} (langue: {language})")
+    async for result in transcribe_stream(ffmpeg_pcm(path), PCM_RATE, 1, language, converter,
+                                          semaphore, max_concurrency):
+        yield result
+
+
+async def transcribe_text(path: str, language: str = 'fr-FR', converter: AudioConverter = None,
+                          **kwargs) -> str:
+    """Transcrit un fichier et retourne le texte complet, dans l'ordre chronologique.
+
+    Les segments du flux ne se recouvrent pas (segment_overlap n'est pas appliqué) :
+    les textes sont simplement joints.
+    """
+    converter = converter or AudioConverter()
+    results = {seg.index: seg.text async for seg in transcribe(path, language, converter, **kwargs)}
+    texts = [results[i] for i in sorted(results)]
+    return converter.format_text(" ".join(t for t in texts if t))
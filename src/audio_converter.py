@@ -1,80 +1,197 @@
 import os
+import queue
 import logging
 import subprocess
 import tempfile
 import wave
 from pathlib import Path
-from pydub import AudioSegment
 import speech_recognition as sr
-from docx import Document
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait
+import threading
 import time
 from typing import List, Tuple
-from PyQt6.QtCore import QObject, pyqtSignal, Qt
+from src.language_detection import LanguageDetector
+from src.languages import AUTO_LANGUAGE
+from src.memory_guard import AdaptiveSlots, get_memory_guard
+from src.metrics import CONVERTER_METRICS
+from src.pcm_buffer import WavReader, as_pcm_buffer
+from src.preprocessing import PreprocessStats
+from src.recognizers import GoogleKeepAliveBackend
+from src.scratch import get_scratch_manager
+from src.signals import SignalDescriptor
+from src.transcript_merge import merge_transcripts
+from src.scheduler import schedule_segments, straggler_tail
+from src.worker_pool import get_shared_executor, get_recognizer_pool
 import datetime
 import gc
 import sys
 
-class AudioConverter(QObject):
-    # Signaux pour la progression
-    progress_updated = pyqtSignal(int, int)  # (segments_traités, total_segments)
-    segment_completed = pyqtSignal(str)  # message de log pour chaque segment
-    error_occurred = pyqtSignal(str)  # Signal pour les erreurs
+def find_ffmpeg():
+    """Retourne la commande ffmpeg (Homebrew et /usr/local prioritaires, sinon le PATH)"""
+    for candidate in ('/opt/homebrew/bin/ffmpeg', '/usr/local/bin/ffmpeg'):
+        if os.path.exists(candidate):
+            return candidate
+    return 'ffmpeg'
+
+class ConversionJob:
+    """État propre à un appel de convert_to_text : annulation et statistiques.
+
+    Un même convertisseur peut servir plusieurs conversions simultanées ; chacune
+    s'arrête et se mesure indépendamment des autres.
+    """
+
+    def __init__(self):
+        self.stats = {}
+        # Compteurs de prétraitement de cette conversion seule
+        self.preprocess = PreprocessStats()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def is_running(self) -> bool:
+        return not self._cancelled.is_set()
+
+
+class AudioConverter:
+    # Signaux pour la progression (sans Qt : utilisables par la CLI et les workers)
+    progress_updated = SignalDescriptor(int, int)  # (segments_traités, total_segments)
+    segment_completed = SignalDescriptor(str)  # message de log pour chaque segment
+    error_occurred = SignalDescriptor(str)  # Signal pour les erreurs
     
-    def __init__(self, max_workers=None):
-        super().__init__()
+    # Backend par défaut partagé : connexions HTTP persistantes par thread du pool
+    default_backend = GoogleKeepAliveBackend()
+    
+    def __init__(self, max_workers=None, metrics=None, recognize_backend=None, scratch=None,
+                 executor=None, recognizer_pool=None, preprocessor=None,
+                 language_detector=None, memory_guard=None):
         # Utiliser le nombre de threads CPU disponibles - 1 (minimum 1)
         self.max_workers = max_workers or max(1, os.cpu_count() - 1)
-        self.language = 'fr-FR'  # Langue par défaut
+        self.language = 'fr-FR'  # Langue par défaut (chaque job peut en demander une autre)
+        self.segment_duration = 45  # Durée des segments en secondes
+        self.segment_overlap = 0  # Recouvrement entre segments voisins en secondes
+        self.job_stats = {}  # Statistiques de la dernière conversion terminée (voir ConversionJob.stats)
         self.supported_formats = ['.wav', '.mp3', '.m4a', '.flac', '.ogg']
-        self.recognizer = sr.Recognizer()
-        self.is_running = False
+        # Conversions en cours sur ce convertisseur
+        self._jobs = set()
+        self._jobs_lock = threading.Lock()
+        # Métriques exposées au format Prometheus (registre partagé par défaut)
+        self.metrics = metrics or CONVERTER_METRICS
+        # Fonction (recognizer, audio, language) -> texte ; Google par défaut
+        self.recognize_backend = recognize_backend or self.default_backend
+        # Ressources partagées entre conversions : pool de threads et Recognizer réutilisés
+        self.executor = executor
+        self.recognizer_pool = recognizer_pool or get_recognizer_pool()
+        # Gestionnaire des fichiers temporaires (budget disque, nettoyage garanti)
+        self.scratch = scratch or get_scratch_manager()
+        # Prétraitement optionnel des segments (AudioPreprocessor), exécuté dans le pool
+        self.preprocessor = preprocessor
+        # Détection de la langue des jobs demandés en 'auto'
+        self.language_detector = language_detector or LanguageDetector()
+        # Plafond mémoire du processus : réduit le nombre de segments en vol quand il approche
+        self.memory_guard = memory_guard or get_memory_guard()
         logging.info(f"Initialisation du convertisseur audio avec {self.max_workers} workers")
 
-    def process_segment(self, segment_data):
-        """Traite un segment audio et retourne le texte transcrit."""
+    @property
+    def is_running(self) -> bool:
+        """Vrai tant qu'une conversion est en cours"""
+        with self._jobs_lock:
+            return any(job.is_running for job in self._jobs)
+
+    @is_running.setter
+    def is_running(self, value):
+        """`is_running = False` annule toutes les conversions en cours (compatibilité)"""
+        if not value:
+            with self._jobs_lock:
+                jobs = list(self._jobs)
+            for job in jobs:
+                job.cancel()
+
+    def process_segment(self, segment_data, language=None, job=None):
+        """Traite un segment audio et retourne le texte transcrit (langue du segment, sinon celle par défaut).
+
+        Le segment (PCMBuffer, ou AudioSegment pour compatibilité) est transmis en
+        mémoire au Recognizer : ni export WAV ni relecture. Le prétraitement est
+        compté dans les statistiques de `job` s'il est donné.
+        """
+        segment, segment_index, start_time, end_time = segment_data
+        language = language or self.language
+        preprocess_stats = job.preprocess if job else None
         try:
-            segment, segment_index, start_time, end_time = segment_data
             logging.debug(f"Segment {segment_index}/16: Tentative 1 de reconnaissance")
+            buffer = as_pcm_buffer(segment)
+            raw_buffer, quiet = buffer, False
+            if self.preprocessor:
+                buffer, quiet = self.preprocessor.process(buffer, preprocess_stats)
+                if buffer is None:
+                    # Segment entièrement silencieux : pas d'aller-retour inutile vers l'API
+                    logging.debug(f"Segment {segment_index}/16: Silencieux, non envoyé")
+                    self.metrics.recognitions.inc(result='skipped_silent')
+                    return segment_index, ""
+            audio = buffer.to_audio_data()
             
-            # Utiliser un fichier temporaire pour le segment
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                segment_path = temp_file.name
-                segment.export(segment_path, format="wav")
-            
-            # Créer un nouvel objet Recognizer pour chaque segment
-            recognizer = sr.Recognizer()
-            with sr.AudioFile(segment_path) as source:
-                # Réduire l'utilisation de la mémoire en limitant la taille du buffer
-                audio = recognizer.record(source, duration=min(45, end_time - start_time))
-                text = recognizer.recognize_google(audio, language=self.language)
-                
-            # Supprimer le fichier temporaire
-            try:
-                os.unlink(segment_path)
-                logging.debug(f"Segment {segment_index} supprimé")
-            except Exception as e:
-                logging.error(f"Erreur lors de la suppression du segment {segment_index}: {str(e)}")
-            
-            logging.debug(f"Segment {segment_index}/16: Reconnaissance réussie ({len(text)} caractères)")
-            return segment_index, text.strip()
-            
-        except sr.UnknownValueError:
-            logging.error(f"Segment {segment_index}/16: Audio incompréhensible")
-            return segment_index, ""
-            
-        except sr.RequestError as e:
-            logging.error(f"Segment {segment_index}/16: Erreur API ({str(e)})")
-            return segment_index, ""
+            # Emprunter un Recognizer à la réserve partagée
+            with self.recognizer_pool.acquire() as recognizer:
+                text = self._recognize(recognizer, audio, segment_index, language)
+                if self.preprocessor:
+                    self.preprocessor.record_result(
+                        quiet, text, lambda: self._recognize_quietly(recognizer, raw_buffer.to_audio_data(), language),
+                        preprocess_stats)
+                return segment_index, text
             
         except Exception as e:
             logging.error(f"Segment {segment_index}/16: Erreur inattendue ({str(e)})")
+            self.metrics.recognitions.inc(result='error')
             return segment_index, ""
-            
+
+    def _recognize(self, recognizer, audio, segment_index, language):
+        """Appelle le backend de reconnaissance ; retourne "" si l'audio est inexploitable"""
+        try:
+            text = self.recognize_backend(recognizer, audio, language)
+        except (sr.UnknownValueError, sr.RequestError) as e:
+            return self.recognition_failed(e, segment_index)
+        return self.recognition_succeeded(text, segment_index)
+
+    def _recognize_quietly(self, recognizer, audio, language):
+        """Reconnaissance de contrôle, hors métriques et logs ; "" en cas d'échec"""
+        try:
+            return self.recognize_backend(recognizer, audio, language).strip()
+        except (sr.UnknownValueError, sr.RequestError):
+            return ""
+
+    def recognition_succeeded(self, text, segment_index):
+        """Comptabilise une reconnaissance réussie et retourne le texte nettoyé"""
+        logging.debug(f"Segment {segment_index}/16: Reconnaissance réussie ({len(text)} caractères)")
+        self.metrics.recognitions.inc(result='success')
+        return text.strip()
+
+    def recognition_failed(self, error, segment_index):
+        """Journalise et comptabilise un échec de reconnaissance ; retourne un texte vide"""
+        if isinstance(error, sr.UnknownValueError):
+            logging.error(f"Segment {segment_index}/16: Audio incompréhensible")
+            self.metrics.recognitions.inc(result='unknown_value')
+        else:
+            logging.error(f"Segment {segment_index}/16: Erreur API ({str(error)})")
+            self.metrics.recognitions.inc(result='request_error')
+        return ""
+
+    def recognize_pcm(self, pcm, sample_rate, sample_width, segment_index, language=None):
+        """Reconnaît un bloc PCM mono en mémoire, sans passer par un fichier WAV"""
+        audio = sr.AudioData(pcm, sample_rate, sample_width)
+        with self.recognizer_pool.acquire() as recognizer:
+            return self._recognize(recognizer, audio, segment_index, language or self.language)
+
+    def _run_segment(self, segment_data, language=None, job=None):
+        """Exécute process_segment dans le pool en alimentant les métriques des workers"""
+        self.metrics.queue_depth.dec()
+        self.metrics.active_workers.inc()
+        start = time.perf_counter()
+        try:
+            return self.process_segment(segment_data, language, job)
         finally:
-            # S'assurer que le segment est libéré de la mémoire
-            del segment
-            gc.collect()
+            self.metrics.segment_latency.observe(time.perf_counter() - start)
+            self.metrics.active_workers.dec()
 
     def format_text(self, text):
         """Formate le texte pour une meilleure lisibilité"""
@@ -87,22 +204,22 @@ class AudioConverter(QObject):
         
         return text
 
-    def convert_to_wav(self, audio_path):
+    def convert_to_wav(self, audio_path, scratch=None):
         """Convertit le fichier audio en WAV"""
-        # Créer un fichier temporaire avec extension .wav
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-            wav_path = temp_file.name
+        # Créer un fichier temporaire avec extension .wav (à libérer par l'appelant)
+        scratch = scratch or self.scratch
+        wav_path = scratch.new_file(suffix='.wav')
         
         try:
             # Chercher ffmpeg dans le PATH
-            ffmpeg_cmd = 'ffmpeg'
-            if os.path.exists('/opt/homebrew/bin/ffmpeg'):
-                ffmpeg_cmd = '/opt/homebrew/bin/ffmpeg'
-            elif os.path.exists('/usr/local/bin/ffmpeg'):
-                ffmpeg_cmd = '/usr/local/bin/ffmpeg'
+            ffmpeg_cmd = find_ffmpeg()
             
             # Construire la commande ffmpeg
             command = [ffmpeg_cmd, '-i', audio_path, '-acodec', 'pcm_s16le', '-ac', '1', '-ar', '44100', '-y', wav_path]
+            # Limiter la taille de sortie au budget disque restant
+            remaining = scratch.remaining()
+            if remaining is not None:
+                command[-2:-2] = ['-fs', str(remaining + 1)]
             logging.info(f"Conversion en WAV: {' '.join(command)}")
             
             # Exécuter la commande
@@ -110,12 +227,12 @@ class AudioConverter(QObject):
             if result.returncode != 0:
                 raise Exception(f"Erreur ffmpeg: {result.stderr}")
             
+            scratch.account(wav_path)
             return wav_path
             
         except Exception as e:
             logging.error(f"Erreur lors de la conversion en WAV: {str(e)}")
-            if os.path.exists(wav_path):
-                os.unlink(wav_path)
+            scratch.release(wav_path)
             raise
 
     def get_audio_duration(self, wav_path):
@@ -133,15 +250,20 @@ class AudioConverter(QObject):
             self.error_occurred.emit(error_msg)
             raise
 
-    def split_audio(self, audio):
-        """Divise le fichier audio en segments"""
+    def split_audio(self, audio, overlap=None):
+        """Divise le fichier audio en segments (chaque segment déborde de `overlap` secondes sur le suivant).
+
+        Avec un PCMBuffer, les segments sont des vues sur le tampon d'origine, sans copie ;
+        avec un WavReader, ce sont des fenêtres lues du disque au moment du traitement.
+        """
         try:
             duration_ms = len(audio)
-            segment_duration_ms = 45 * 1000
+            segment_duration_ms = int(self.segment_duration * 1000)
+            overlap_ms = int((self.segment_overlap if overlap is None else overlap) * 1000)
             segments = []
             
             for start_ms in range(0, duration_ms, segment_duration_ms):
-                end_ms = min(start_ms + segment_duration_ms, duration_ms)
+                end_ms = min(start_ms + segment_duration_ms + overlap_ms, duration_ms)
                 
                 # Extraire le segment
                 segment = audio[start_ms:end_ms]
@@ -155,6 +277,10 @@ class AudioConverter(QObject):
                 
                 logging.info(f"Segment créé: {start_s:.1f}s - {end_s:.1f}s")
                 
+                # Le recouvrement a atteint la fin : un segment de plus serait inclus dans celui-ci
+                if end_ms >= duration_ms:
+                    break
+                
             return segments
             
         except Exception as e:
@@ -165,6 +291,8 @@ class AudioConverter(QObject):
     def save_to_word(self, text, output_path):
         """Sauvegarde le texte dans un document Word"""
         try:
+            # python-docx n'est chargé qu'à la première sauvegarde Word
+            from docx import Document
             doc = Document()
             
             # Ajouter un titre
@@ -190,83 +318,187 @@ class AudioConverter(QObject):
             self.error_occurred.emit(error_msg)
             raise
 
-    def convert_to_text(self, audio_path: str, language: str = None) -> str:
-        """Convertit un fichier audio en texte"""
+    def convert_to_text(self, audio_path: str, language: str = None, job: ConversionJob = None) -> str:
+        """Convertit un fichier audio en texte (`job` permet d'annuler cette conversion seule)"""
+        job = job or ConversionJob()
+        with self._jobs_lock:
+            self._jobs.add(job)
         try:
-            self.is_running = True
-            if language:
-                self.language = language
+            # Langue propre au job : l'état partagé du convertisseur n'est pas modifié
+            language = language or self.language
             
-            logging.info(f"Début de la conversion de {audio_path} en texte (langue: {self.language})")
+            logging.info(f"Début de la conversion de {audio_path} en texte (langue: {language})")
             
             # Vérifier si le fichier existe
             if not os.path.exists(audio_path):
                 raise FileNotFoundError(f"Le fichier {audio_path} n'existe pas")
             
-            # Convertir en WAV si nécessaire
-            wav_path = self.convert_to_wav(audio_path)
-            logging.info(f"Fichier converti en WAV : {wav_path}")
+            started_at = time.perf_counter()
             
-            # Charger l'audio
-            audio = AudioSegment.from_wav(wav_path)
-            logging.info(f"Fichier audio chargé, durée : {len(audio)/1000} secondes")
+            # Répertoire de travail du job : supprimé en sortie, même en cas d'erreur
+            with self.scratch.job() as scratch:
+                # Convertir en WAV si nécessaire
+                wav_path = self.convert_to_wav(audio_path, scratch)
+                logging.info(f"Fichier converti en WAV : {wav_path}")
             
-            # Diviser en segments
-            segments = self.split_audio(audio)
-            total_segments = len(segments)
-            logging.info(f"Audio divisé en {total_segments} segments")
+                # Ouvrir le WAV sans le charger : chaque segment est lu au moment d'être soumis
+                with WavReader(wav_path) as audio:
+                    logging.info(f"Fichier audio ouvert, durée : {len(audio)/1000} secondes")
+                    
+                    # Diviser en segments (fenêtres paresseuses sur le fichier)
+                    segments = self.split_audio(audio)
+                    total_segments = len(segments)
+                    logging.info(f"Audio divisé en {total_segments} segments")
+                    
+                    # Détection de la langue sur quelques extraits, puis routage de tous les segments
+                    detection = None
+                    if language == AUTO_LANGUAGE:
+                        fallback = self.language if self.language != AUTO_LANGUAGE else None
+                        detection = self.language_detector.detect(self, segments, fallback)
+                        language = detection.language
+                    
+                    results, completion_times, slots = self._transcribe_segments(segments, language, job)
             
-            # Initialiser le résultat
-            result_text = []
-            segments_processed = 0
+            # Remettre les textes dans l'ordre chronologique
+            result_text = [results[index] for index in sorted(results)]
             
-            # Créer un pool de threads
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Soumettre les tâches
-                futures = []
-                for segment in segments:
-                    if not self.is_running:
-                        logging.info("Conversion interrompue")
-                        break
-                    futures.append(executor.submit(self.process_segment, segment))
-                
-                # Traiter les résultats
-                for future in futures:
-                    if not self.is_running:
-                        break
-                    try:
-                        index, text = future.result()
-                        result_text.append(text)
-                        segments_processed += 1
-                        progress = (segments_processed * 100) // total_segments
-                        self.progress_updated.emit(segments_processed, total_segments)
-                        self.segment_completed.emit(f"Segment {index} traité")
-                    except Exception as e:
-                        error_msg = f"Erreur lors du traitement d'un segment : {str(e)}"
-                        logging.error(error_msg)
-                        self.error_occurred.emit(error_msg)
+            # Fusionner les recouvrements entre segments voisins
+            merge_start = time.perf_counter()
+            duplicates_removed = 0
+            if self.segment_overlap > 0:
+                final_text, duplicates_removed = merge_transcripts(result_text, self.segment_overlap)
+            else:
+                final_text = " ".join(text for text in result_text if text)
+            merge_time = time.perf_counter() - merge_start
             
-            # Nettoyer le fichier WAV temporaire
-            if wav_path != audio_path:
-                try:
-                    os.unlink(wav_path)
-                    logging.info("Fichier WAV temporaire supprimé")
-                except Exception as e:
-                    logging.warning(f"Impossible de supprimer le fichier temporaire : {str(e)}")
+            # Coût du recouvrement : audio envoyé en plus à la reconnaissance
+            audio_seconds = audio.duration_seconds
+            recognized_seconds = sum(end - start for _, _, start, end in segments)
+            overlap_seconds = max(0.0, recognized_seconds - audio_seconds)
+            self.metrics.overlap_seconds.inc(overlap_seconds)
+            job.stats = {
+                'language': language,
+                'segments': total_segments,
+                'audio_seconds': audio_seconds,
+                'overlap_seconds': overlap_seconds,
+                'overlap_cost_ratio': overlap_seconds / audio_seconds if audio_seconds else 0.0,
+                'duplicate_words_removed': duplicates_removed,
+                'merge_seconds': merge_time,
+                'tail_seconds': straggler_tail(completion_times, self.max_workers),
+                'peak_in_flight': slots.peak_in_use,
+                'lowest_concurrency': slots.lowest_limit,
+                'total_seconds': time.perf_counter() - started_at,
+            }
+            if detection:
+                job.stats['language_detection'] = {'scores': detection.scores, 'requests': detection.requests,
+                                                   'seconds': detection.seconds}
+            if self.preprocessor:
+                job.stats['preprocess'] = job.preprocess.log_summary()
+            job.stats['cancelled'] = not job.is_running
+            self.job_stats = job.stats
+            logging.info(f"Statistiques du job : {total_segments} segments, recouvrement "
+                         f"{overlap_seconds:.1f}s (+{job.stats['overlap_cost_ratio']:.1%} d'audio), "
+                         f"{duplicates_removed} mots dupliqués supprimés en {merge_time * 1000:.1f} ms, "
+                         f"traîne {job.stats['tail_seconds']:.1f}s")
             
-            # Formater et retourner le texte final
-            final_text = " ".join(result_text)
+            # Formater et retourner le texte final (partiel si la conversion a été annulée)
             final_text = self.format_text(final_text)
-            logging.info("Conversion terminée avec succès")
+            if job.is_running:
+                logging.info("Conversion terminée avec succès")
+                self.metrics.conversions.inc(status='success')
+            else:
+                logging.info(f"Conversion annulée ({len(results)}/{total_segments} segments traités)")
+                self.metrics.conversions.inc(status='cancelled')
             return final_text
             
         except Exception as e:
             error_msg = f"Erreur lors de la conversion : {str(e)}"
             logging.error(error_msg)
+            self.metrics.conversions.inc(status='error')
             self.error_occurred.emit(error_msg)
             raise
         finally:
-            self.is_running = False
+            with self._jobs_lock:
+                self._jobs.discard(job)
+
+    def _transcribe_segments(self, segments, language, job):
+        """Pipeline borné : lecture des segments → reconnaissance dans le pool → assemblage.
+
+        Un thread lit chaque segment (les plus chargés en parole d'abord) puis attend une place
+        avant de le soumettre ; une place n'est rendue qu'une fois le résultat assemblé.
+        La lecture s'arrête donc quand la reconnaissance prend du retard : au plus
+        `max_workers` segments, plus un lu d'avance, occupent la mémoire, et moins quand
+        la garde mémoire abaisse la limite.
+        """
+        executor = self.executor or get_shared_executor(self.max_workers)
+        slots = AdaptiveSlots(self.max_workers, self.memory_guard)
+        completed = queue.Queue()
+        stop = threading.Event()
+        futures = []
+        submitted = 0
+        
+        def feed():
+            nonlocal submitted
+            try:
+                for segment, index, start, end in schedule_segments(segments):
+                    if stop.is_set() or not job.is_running:
+                        logging.info("Conversion interrompue")
+                        return
+                    buffer = as_pcm_buffer(segment)
+                    while not slots.acquire(timeout=slots.recheck):
+                        if stop.is_set() or not job.is_running:
+                            return
+                    self.metrics.queue_depth.inc()
+                    future = executor.submit(self._run_segment, (buffer, index, start, end), language, job)
+                    futures.append(future)
+                    submitted += 1
+                    future.add_done_callback(completed.put)
+            except Exception as e:
+                completed.put(e)
+            finally:
+                # Fin de la lecture : plus aucun segment ne sera soumis
+                completed.put(None)
+        
+        feeder = threading.Thread(target=feed, name='audio2text-decode', daemon=True)
+        feeder.start()
+        results = {}
+        completion_times = []
+        feeding = True
+        received = 0
+        try:
+            # Traiter les résultats dans l'ordre où ils se terminent
+            while feeding or received < submitted:
+                item = completed.get()
+                if item is None:
+                    feeding = False
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                received += 1
+                slots.release()
+                if not job.is_running:
+                    break
+                try:
+                    index, text = item.result()
+                    results[index] = text
+                    completion_times.append(time.perf_counter())
+                    self.progress_updated.emit(len(results), len(segments))
+                    self.segment_completed.emit(f"Segment {index} traité")
+                except Exception as e:
+                    error_msg = f"Erreur lors du traitement d'un segment : {str(e)}"
+                    logging.error(error_msg)
+                    self.error_occurred.emit(error_msg)
+        finally:
+            # Arrêter la lecture, annuler ce qui n'a pas démarré et attendre les segments en cours
+            stop.set()
+            feeder.join()
+            for future in futures:
+                if future.cancel():
+                    self.metrics.queue_depth.dec()
+            wait(futures)
+        if slots.lowest_limit < self.max_workers:
+            logging.warning(f"Garde mémoire : jusqu'à {slots.lowest_limit}/{self.max_workers} segments en vol")
+        return results, completion_times, slots
 
     def convert_audio(self, input_file: str, output_format: str = 'wav') -> str:
         """Convertit un fichier audio dans le format spécifié."""
@@ -299,6 +531,7 @@ class AudioConverter(QObject):
             
             # Charger le fichier audio
             try:
+                from pydub import AudioSegment
                 audio = AudioSegment.from_file(file_path)
                 duration = len(audio) / 1000.0  # Convertir en secondes
                 logging.info(f"Durée obtenue : {duration} secondes")
@@ -0,0 +1,238 @@
+import os
+import sys
+import argparse
+import logging
+import time
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.job_queue import JobQueue, JobQueueService, QueueFullError, PRIORITIES
+from src.languages import AUTO_LANGUAGE
+
+# Code de sortie "réessayer plus tard" (sysexits.h) quand la file est pleine
+EXIT_QUEUE_FULL = 75
+
+
+def _open_queue(args):
+    return JobQueue(args.db, max_backlog=args.max_backlog)
+
+
+def cmd_submit(args):
+    queue = _open_queue(args)
+    try:
+        for audio_path in args.files:
+            output_path = args.output
+            if output_path and len(args.files) > 1:
+                base = os.path.splitext(os.path.basename(audio_path))[0]
+                output_path = os.path.join(output_path, base + '.txt')
+            job_id = queue.submit(os.path.abspath(audio_path), args.language, PRIORITIES[args.priority],
+                                  output_path=output_path, block=args.wait, timeout=args.timeout)
+            print(job_id)
+    except QueueFullError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_QUEUE_FULL
+    finally:
+        queue.close()
+    return 0
+
+
+def _preprocessor(args):
+    if not args.preprocess:
+        return None
+    from src.preprocessing import AudioPreprocessor
+    return AudioPreprocessor(verify_raw=args.verify_preprocess)
+
+
+def cmd_worker(args):
+    queue = _open_queue(args)
+    metrics_server = None
+    if args.metrics_port is not None:
+        from src.metrics import start_metrics_server
+        metrics_server = start_metrics_server(args.metrics_port)
+
+    backend = None
+    if args.replay:
+        from src.replay import Recording, ReplayBackend
+        backend = ReplayBackend(Recording.load(args.replay), speed=args.replay_speed)
+    elif args.record:
+        from src.audio_converter import AudioConverter
+        from src.replay import RecordingBackend
+        backend = RecordingBackend(AudioConverter.default_backend, path=args.record)
+
+    memory_guard = None
+    if args.max_rss:
+        from src.memory_guard import MemoryGuard
+        memory_guard = MemoryGuard(args.max_rss)
+
+    def converter_factory(max_workers):
+        from src.audio_converter import AudioConverter
+        converter = AudioConverter(max_workers=max_workers, preprocessor=_preprocessor(args),
+                                   recognize_backend=backend, memory_guard=memory_guard)
+        converter.segment_overlap = args.overlap
+        return converter
+
+    service = JobQueueService(queue, max_concurrent_jobs=args.jobs, worker_budget=args.workers,
+                              converter_factory=converter_factory).start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        logging.info("Interruption demandée")
+    finally:
+        service.stop()
+        if args.record and not args.replay:
+            backend.save()
+        if metrics_server:
+            metrics_server.stop()
+        queue.close()
+    return 0
+
+
+def cmd_status(args):
+    queue = _open_queue(args)
+    try:
+        jobs = [queue.get(args.job_id)] if args.job_id else queue.list(args.status)
+        for job in jobs:
+            if job is None:
+                print(f"Job {args.job_id} introuvable", file=sys.stderr)
+                return 1
+            print(f"{job['id']}\t{job['status']}\t{job['priority']}\t{job['progress']}%\t{job['audio_path']}")
+    finally:
+        queue.close()
+    return 0
+
+
+def cmd_cancel(args):
+    queue = _open_queue(args)
+    try:
+        return 0 if queue.cancel(args.job_id) else 1
+    finally:
+        queue.close()
+
+
+def cmd_live(args):
+    from src.audio_converter import AudioConverter
+    from src.live_transcriber import LiveTranscriber
+    backend = None
+    if args.offline:
+        from src.recognizers import OfflineRecognizer
+        backend = OfflineRecognizer()
+    converter = AudioConverter(max_workers=args.workers, recognize_backend=backend,
+                               preprocessor=_preprocessor(args))
+
+    def print_partial(index, start, end, text):
+        print(f"[{start:7.1f}s - {end:7.1f}s] {text}", flush=True)
+
+    transcriber = LiveTranscriber(converter, sample_rate=args.rate, channels=args.channels,
+                                  on_partial=print_partial, pause_ms=args.pause_ms,
+                                  max_segment_s=args.max_segment, language=args.language)
+    stream = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    try:
+        text = transcriber.feed_stream(stream)
+    except KeyboardInterrupt:
+        text = transcriber.close()
+    finally:
+        stream.close()
+    logging.info(f"Transcription live terminée ({len(text)} caractères)")
+    return 0
+
+
+def cmd_startup(args):
+    from src.startup import DEFAULT_MODULES, format_report, import_report
+    for module in args.modules or DEFAULT_MODULES:
+        print(format_report(import_report(module), top=args.top))
+    return 0
+
+
+def _add_preprocess_arguments(parser):
+    parser.add_argument('--preprocess', action='store_true',
+                        help="Prétraiter les segments (passe-haut, noise gate, normalisation du gain)")
+    parser.add_argument('--verify-preprocess', action='store_true',
+                        help="Mesurer exactement les segments sauvés (requête supplémentaire par segment faible)")
+
+
+def _live_language(value):
+    if value == AUTO_LANGUAGE:
+        raise argparse.ArgumentTypeError("détection automatique non disponible en direct, préciser la langue")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='audio2text-cli', description="Audio2Text en ligne de commande")
+    parser.add_argument('--db', help="Chemin de la base de la file de jobs")
+    parser.add_argument('--scratch-dir', help="Répertoire des fichiers temporaires (stockage local rapide)")
+    parser.add_argument('--scratch-quota', help="Budget disque des fichiers temporaires (ex. 2G)")
+    parser.add_argument('--max-backlog', type=int, default=100, help="Nombre maximal de jobs en attente")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Logs détaillés")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    submit = subparsers.add_parser('submit', help="Ajouter des fichiers à la file")
+    submit.add_argument('files', nargs='+')
+    submit.add_argument('-l', '--language', default='fr-FR', help="Code de langue, ou 'auto' pour la détecter")
+    submit.add_argument('-p', '--priority', choices=list(PRIORITIES), default='bulk')
+    submit.add_argument('-o', '--output', help="Fichier de sortie (.txt/.docx) ou dossier si plusieurs fichiers")
+    submit.add_argument('--wait', action='store_true', help="Attendre qu'une place se libère si la file est pleine")
+    submit.add_argument('--timeout', type=float, help="Durée maximale d'attente avec --wait")
+    submit.set_defaults(func=cmd_submit)
+
+    worker = subparsers.add_parser('worker', help="Exécuter les jobs de la file")
+    worker.add_argument('-j', '--jobs', type=int, default=1, help="Jobs simultanés")
+    worker.add_argument('-w', '--workers', type=int, help="Budget global de threads de reconnaissance")
+    worker.add_argument('--overlap', type=float, default=0,
+                        help="Recouvrement entre segments voisins (s), dédupliqué à la fusion")
+    worker.add_argument('--metrics-port', type=int, help="Exposer /metrics sur ce port local")
+    worker.add_argument('--max-rss', help="Plafond de mémoire du processus (ex. 2G) ; réduit la concurrence à l'approche")
+    _add_preprocess_arguments(worker)
+    worker.add_argument('--record', help="Enregistrer les réponses de reconnaissance dans ce fichier")
+    worker.add_argument('--replay', help="Rejouer un enregistrement au lieu d'appeler l'API")
+    worker.add_argument('--replay-speed', type=float, default=1.0, help="Accélération du rejeu")
+    worker.set_defaults(func=cmd_worker)
+
+    status = subparsers.add_parser('status', help="Afficher l'état des jobs")
+    status.add_argument('job_id', type=int, nargs='?')
+    status.add_argument('-s', '--status', help="Filtrer par statut")
+    status.set_defaults(func=cmd_status)
+
+    live = subparsers.add_parser('live', help="Transcrire en direct un flux PCM 16 bits ou WAV")
+    live.add_argument('input', nargs='?', default='-', help="Fichier ou pipe à lire ('-' : stdin)")
+    live.add_argument('-l', '--language', default='fr-FR', type=_live_language,
+                      help="Code de langue (pas de détection automatique en direct)")
+    live.add_argument('--rate', type=int, default=16000, help="Fréquence du PCM brut")
+    live.add_argument('--channels', type=int, default=1, help="Canaux du PCM brut")
+    live.add_argument('--pause-ms', type=int, default=500, help="Silence déclenchant un découpage")
+    live.add_argument('--max-segment', type=float, default=15.0, help="Durée maximale d'un segment (s)")
+    live.add_argument('-w', '--workers', type=int)
+    live.add_argument('--offline', action='store_true', help="Utiliser le reconnaisseur factice hors ligne")
+    _add_preprocess_arguments(live)
+    live.set_defaults(func=cmd_live)
+
+    cancel = subparsers.add_parser('cancel', help="Annuler un job")
+    cancel.add_argument('job_id', type=int)
+    cancel.set_defaults(func=cmd_cancel)
+
+    startup = subparsers.add_parser('startup', help="Temps de chargement des modules, par import")
+    startup.add_argument('modules', nargs='*', help="Modules à mesurer (par défaut : interface, CLI, convertisseur)")
+    startup.add_argument('--top', type=int, default=10, help="Nombre de paquets affichés par module")
+    startup.set_defaults(func=cmd_startup)
+    return parser
+
+
+def main(argv=None):
+    """Point d'entrée de la ligne de commande"""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        stream=sys.stderr,
+    )
+    # Lus par le gestionnaire de fichiers temporaires à sa création
+    if args.scratch_dir:
+        os.environ['AUDIO2TEXT_SCRATCH_DIR'] = args.scratch_dir
+    if args.scratch_quota:
+        os.environ['AUDIO2TEXT_SCRATCH_QUOTA'] = args.scratch_quota
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,372 @@
+import os
+import logging
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.metrics import REGISTRY
+from src.system_utils import pid_alive
+
+# Priorités : les jobs interactifs passent devant le traitement de masse
+PRIORITY_BULK = 0
+PRIORITY_NORMAL = 50
+PRIORITY_INTERACTIVE = 100
+
+PRIORITIES = {
+    'bulk': PRIORITY_BULK,
+    'normal': PRIORITY_NORMAL,
+    'interactive': PRIORITY_INTERACTIVE,
+}
+
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+
+ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+FINAL_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+JOBS_GAUGE = REGISTRY.gauge('audio2text_jobs', "Jobs de la file par statut", ['status'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    audio_path TEXT NOT NULL,
+    language TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    output_path TEXT,
+    result TEXT,
+    error TEXT,
+    progress INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_priority ON jobs (status, priority DESC, id);
+"""
+
+
+def default_data_dir() -> Path:
+    """Répertoire des données persistantes (file de jobs, etc.)"""
+    return Path(os.environ.get('AUDIO2TEXT_DATA_DIR', Path.home() / '.audio2text'))
+
+
+class QueueFullError(Exception):
+    """Levée quand la file a atteint sa taille maximale"""
+
+
+def _worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """File de jobs de transcription persistante (SQLite) avec priorités et taille bornée"""
+
+    def __init__(self, db_path=None, max_backlog: int = 100):
+        self.db_path = Path(db_path) if db_path else default_data_dir() / 'jobs.db'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_backlog = max_backlog
+        self._lock = threading.Lock()
+        self._space_available = threading.Condition(self._lock)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if 'owner' not in columns:
+            # Base créée par une version antérieure
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self.recover()
+        logging.info(f"File de jobs ouverte : {self.db_path}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _backlog_size(self):
+        """Jobs actifs soumis au plafond (les jobs interactifs n'y comptent pas)"""
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?) AND priority < ?",
+            ACTIVE_STATUSES + (PRIORITY_INTERACTIVE,)).fetchone()
+        return row[0]
+
+    def submit(self, audio_path: str, language: str = 'fr-FR', priority: int = PRIORITY_NORMAL,
+               output_path: str = None, block: bool = False, timeout: float = None, owner: str = None) -> int:
+        """Ajoute un job ; lève QueueFullError si la file est pleine (ou attend si block=True).
+
+        Les jobs interactifs ne sont jamais refusés : le plafond `max_backlog` ne borne
+        que le traitement de masse. `owner` réserve le job au service qui porte ce nom.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._space_available:
+            while priority < PRIORITY_INTERACTIVE and self._backlog_size() >= self.max_backlog:
+                if not block:
+                    raise QueueFullError(f"File de jobs pleine ({self.max_backlog} jobs en attente)")
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise QueueFullError(f"File de jobs pleine ({self.max_backlog} jobs en attente)")
+                # Un autre processus peut aussi libérer de la place : réveil périodique
+                self._space_available.wait(min(remaining, 1.0) if remaining is not None else 1.0)
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (audio_path, language, priority, status, output_path, owner, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(audio_path), language, int(priority), STATUS_PENDING, output_path, owner, time.time()))
+            job_id = cursor.lastrowid
+        logging.info(f"Job {job_id} ajouté à la file (priorité {priority}) : {audio_path}")
+        return job_id
+
+    def claim(self, owner: str = None) -> Optional[Dict]:
+        """Réserve atomiquement le job en attente le plus prioritaire.
+
+        Sans `owner`, seuls les jobs non réservés sont candidats ; avec `owner`, seuls
+        ceux de ce service.
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                if owner is None:
+                    # Les jobs réservés à un service (interface graphique) ne sont jamais pris ici
+                    row = self._conn.execute(
+                        "SELECT * FROM jobs WHERE status = ? AND owner IS NULL "
+                        "ORDER BY priority DESC, id LIMIT 1",
+                        (STATUS_PENDING,)).fetchone()
+                else:
+                    row = self._conn.execute(
+                        "SELECT * FROM jobs WHERE status = ? AND owner = ? ORDER BY priority DESC, id LIMIT 1",
+                        (STATUS_PENDING, owner)).fetchone()
+                if row is None:
+                    self._conn.execute('COMMIT')
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, started_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ?", (STATUS_RUNNING, _worker_id(), time.time(), row['id']))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return self.get(row['id'])
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self._space_available:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? "
+                "WHERE id = ? AND status = ?",
+                (status, result, error, time.time(), job_id, STATUS_RUNNING))
+            self._space_available.notify_all()
+
+    def complete(self, job_id: int, result: str):
+        self._finish(job_id, STATUS_DONE, result=result)
+        logging.info(f"Job {job_id} terminé")
+
+    def fail(self, job_id: int, error: str):
+        self._finish(job_id, STATUS_FAILED, error=error)
+        logging.error(f"Job {job_id} en échec : {error}")
+
+    def cancel(self, job_id: int) -> bool:
+        """Annule un job en attente ou en cours ; retourne False s'il est déjà terminé"""
+        with self._space_available:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status IN (?, ?)",
+                (STATUS_CANCELLED, time.time(), job_id) + ACTIVE_STATUSES)
+            self._space_available.notify_all()
+        if cursor.rowcount:
+            logging.info(f"Job {job_id} annulé")
+        return bool(cursor.rowcount)
+
+    def set_progress(self, job_id: int, progress: int):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (int(progress), job_id))
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, status: str = None) -> List[Dict]:
+        with self._lock:
+            if status:
+                rows = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, id", (status,)).fetchall()
+            else:
+                rows = self._conn.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def wait_for(self, job_id: int, timeout: float = None, interval: float = 0.2) -> Dict:
+        """Attend qu'un job atteigne un état final et le retourne"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in FINAL_STATUSES:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(interval)
+
+    def recover(self) -> int:
+        """Remet en attente les jobs 'running' dont le processus worker a disparu (redémarrage).
+
+        Les jobs réservés à un service arrêté (interface graphique fermée ou plantée) sont
+        annulés : le service redémarré porte un autre nom et personne n'en lirait le résultat.
+        """
+        hostname = socket.gethostname()
+        recovered = abandoned = 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, status, worker, owner FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES).fetchall()
+            for row in rows:
+                if row['owner'] is not None:
+                    host, _, pid = row['owner'].rpartition(':')
+                    if host == hostname and pid.isdigit() and not pid_alive(int(pid)):
+                        self._conn.execute(
+                            "UPDATE jobs SET status = ?, worker = NULL, error = ?, finished_at = ? WHERE id = ?",
+                            (STATUS_CANCELLED, "Service propriétaire arrêté", time.time(), row['id']))
+                        abandoned += 1
+                        continue
+                if row['status'] != STATUS_RUNNING:
+                    continue
+                host, _, pid = (row['worker'] or '').rpartition(':')
+                if host == hostname and pid.isdigit() and pid_alive(int(pid)):
+                    continue
+                if host and host != hostname:
+                    # Worker d'une autre machine : impossible de savoir s'il tourne encore
+                    continue
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, progress = 0 WHERE id = ?",
+                    (STATUS_PENDING, row['id']))
+                recovered += 1
+        if recovered:
+            logging.warning(f"{recovered} job(s) interrompu(s) remis en attente")
+        if abandoned:
+            logging.warning(f"{abandoned} job(s) d'un service arrêté annulé(s)")
+        return recovered
+
+
+class JobQueueService:
+    """Exécute les jobs de la file avec un budget global de concurrence.
+
+    Avec `own_jobs_only` (interface graphique), le service n'exécute que les jobs
+    soumis par sa méthode submit, jamais ceux des autres processus.
+    """
+
+    def __init__(self, queue: JobQueue, max_concurrent_jobs: int = 1, worker_budget: int = None,
+                 converter_factory: Callable = None, poll_interval: float = 0.5, own_jobs_only: bool = False):
+        self.queue = queue
+        self.owner = _worker_id() if own_jobs_only else None
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        # Budget total de threads de reconnaissance, partagé entre les jobs simultanés
+        self.worker_budget = worker_budget or max(1, (os.cpu_count() or 2) - 1)
+        self.converter_factory = converter_factory or self._default_converter
+        self.poll_interval = poll_interval
+        self._threads = []
+        self._stop = threading.Event()
+        self._running = {}
+        self._running_lock = threading.Lock()
+
+    def submit(self, audio_path: str, language: str = 'fr-FR', priority: int = PRIORITY_NORMAL,
+               output_path: str = None, **kwargs) -> int:
+        """Soumet un job à la file, réservé à ce service s'il n'exécute que ses propres jobs"""
+        return self.queue.submit(audio_path, language, priority, output_path, owner=self.owner, **kwargs)
+
+    def _default_converter(self, max_workers):
+        from src.audio_converter import AudioConverter
+        return AudioConverter(max_workers=max_workers)
+
+    def start(self):
+        # Le pool de threads partagé porte le budget global de reconnaissance
+        from src.worker_pool import get_shared_executor
+        get_shared_executor(self.worker_budget)
+        self._stop.clear()
+        for i in range(self.max_concurrent_jobs):
+            thread = threading.Thread(target=self._worker_loop, name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logging.info(f"Service de jobs démarré ({self.max_concurrent_jobs} job(s) simultané(s), "
+                     f"{self.worker_budget} workers)")
+        return self
+
+    def stop(self, wait: bool = True):
+        """Arrête le service ; les jobs interrompus seront repris au prochain démarrage"""
+        self._stop.set()
+        with self._running_lock:
+            for conversion in self._running.values():
+                conversion.cancel()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+        logging.info("Service de jobs arrêté")
+
+    def cancel(self, job_id: int) -> bool:
+        cancelled = self.queue.cancel(job_id)
+        with self._running_lock:
+            conversion = self._running.get(job_id)
+            if conversion:
+                conversion.cancel()
+        return cancelled
+
+    def _update_metrics(self):
+        counts = self.queue.counts()
+        for status in ACTIVE_STATUSES + FINAL_STATUSES:
+            JOBS_GAUGE.set(counts.get(status, 0), status=status)
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim(self.owner)
+            except sqlite3.Error as e:
+                logging.error(f"Erreur d'accès à la file de jobs : {str(e)}")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            self._update_metrics()
+            self.run_job(job)
+            self._update_metrics()
+
+    def run_job(self, job: Dict):
+        from src.audio_converter import ConversionJob
+        job_id = job['id']
+        converter = self.converter_factory(max(1, self.worker_budget // self.max_concurrent_jobs))
+        converter.progress_updated.connect(
+            lambda done, total: self.queue.set_progress(job_id, (done * 100) // max(1, total)))
+        conversion = ConversionJob()
+        with self._running_lock:
+            self._running[job_id] = conversion
+        try:
+            logging.info(f"Job {job_id} démarré : {job['audio_path']}")
+            result = converter.convert_to_text(job['audio_path'], job['language'], conversion)
+            if self._stop.is_set():
+                # Arrêt du service : le job sera repris au redémarrage
+                return
+            if self.queue.get(job_id)['status'] == STATUS_CANCELLED:
+                return
+            if job['output_path']:
+                self._write_output(converter, result, job['output_path'])
+            self.queue.complete(job_id, result)
+        except Exception as e:
+            if not self._stop.is_set():
+                self.queue.fail(job_id, str(e))
+        finally:
+            with self._running_lock:
+                self._running.pop(job_id, None)
+
+    def _write_output(self, converter, text, output_path):
+        if output_path.lower().endswith('.docx'):
+            converter.save_to_word(text, output_path)
+        else:
+            Path(output_path).write_text(text, encoding='utf-8')
+        logging.info(f"Transcription écrite dans {output_path}")
@@ -0,0 +1,89 @@
+import time
+import heapq
+import logging
+from typing import Dict, List, NamedTuple, Sequence
+
+import speech_recognition as sr
+
+from src.pcm_buffer import as_pcm_buffer
+from src.worker_pool import get_shared_executor
+
+# Candidats par défaut : une variante par langue
+DEFAULT_CANDIDATES = ['fr-FR', 'en-US', 'de-DE', 'es-ES', 'it-IT']
+
+
+class DetectionResult(NamedTuple):
+    language: str
+    scores: Dict[str, float]
+    requests: int
+    seconds: float
+
+
+def score_recognition(backend, recognizer, audio, language) -> float:
+    """Score d'une langue sur un extrait : mots reconnus × confiance (si le backend la fournit)"""
+    try:
+        if hasattr(backend, 'recognize_with_confidence'):
+            text, confidence = backend.recognize_with_confidence(recognizer, audio, language)
+        else:
+            text, confidence = backend(recognizer, audio, language), 1.0
+    except sr.UnknownValueError:
+        return 0.0
+    except sr.RequestError as e:
+        logging.warning(f"Détection de langue : erreur API pour {language} ({str(e)})")
+        return 0.0
+    return len(text.split()) * (1.0 if confidence is None else confidence)
+
+
+class LanguageDetector:
+    """Choisit la langue d'un fichier à partir de quelques extraits courts.
+
+    Les `samples` segments les plus énergiques (probablement parlés) sont tronqués à
+    `sample_seconds` puis reconnus dans chaque langue candidate, en parallèle dans le
+    pool ; la langue au meilleur score est ensuite appliquée à tout le fichier.
+    """
+
+    def __init__(self, candidates: Sequence[str] = None, samples: int = 3, sample_seconds: float = 8.0):
+        self.candidates = list(candidates or DEFAULT_CANDIDATES)
+        self.samples = samples
+        self.sample_seconds = sample_seconds
+
+    def pick_samples(self, segments) -> List:
+        """Extraits des segments les plus énergiques, dans l'ordre chronologique.
+
+        Les segments sont parcourus un à un : seuls les `samples` meilleurs extraits
+        restent en mémoire (utile quand les segments sont lus du disque à la demande).
+        """
+        best = []
+        for position, (segment, _, _, _) in enumerate(segments):
+            buffer = as_pcm_buffer(segment)
+            level = buffer.rms
+            if level > 0:
+                # À niveau égal, le segment le plus ancien est conservé
+                heapq.heappush(best, (level, -position, buffer[:self.sample_seconds * 1000]))
+                if len(best) > self.samples:
+                    heapq.heappop(best)
+        return [sample for _, _, sample in sorted(best, key=lambda item: -item[1])]
+
+    def detect(self, converter, segments, fallback: str = None) -> DetectionResult:
+        start = time.perf_counter()
+        fallback = fallback or self.candidates[0]
+        samples = [sample.to_audio_data() for sample in self.pick_samples(segments)]
+        executor = converter.executor or get_shared_executor(converter.max_workers)
+
+        def run(args):
+            audio, language = args
+            with converter.recognizer_pool.acquire() as recognizer:
+                return language, score_recognition(converter.recognize_backend, recognizer, audio, language)
+
+        scores = {language: 0.0 for language in self.candidates}
+        requests = [(audio, language) for audio in samples for language in self.candidates]
+        for language, score in executor.map(run, requests):
+            scores[language] += score
+        best = max(self.candidates, key=lambda language: scores[language])
+        if scores[best] <= 0:
+            logging.warning(f"Détection de langue sans résultat, langue par défaut : {fallback}")
+            best = fallback
+        result = DetectionResult(best, scores, len(requests), time.perf_counter() - start)
+        logging.info(f"Langue détectée : {best} ({len(requests)} requêtes en {result.seconds:.1f}s, "
+                     f"scores {', '.join(f'{k}={v:.1f}' for k, v in scores.items())})")
+        return result
@@ -0,0 +1,19 @@
+# Langues proposées dans l'interface (nom affiché → code de langue)
+SUPPORTED_LANGUAGES = {
+    'Français': 'fr-FR',
+    'English (US)': 'en-US',
+    'English (UK)': 'en-GB',
+    'Deutsch': 'de-DE',
+    'Español': 'es-ES',
+    'Italiano': 'it-IT',
+    'Nederlands': 'nl-NL',
+    'Polski': 'pl-PL',
+    'Português': 'pt-PT',
+    'Русский': 'ru-RU',
+    '日本語': 'ja-JP',
+    '한국어': 'ko-KR',
+    '中文': 'zh-CN'
+}
+
+# Code de langue demandant une détection automatique
+AUTO_LANGUAGE = 'auto'
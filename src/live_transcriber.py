@@ -0,0 +1,193 @@
+import time
+import wave
+import logging
+import threading
+from typing import Callable, List
+
+import numpy as np
+
+from src.languages import AUTO_LANGUAGE
+from src.pcm_buffer import PCMBuffer
+from src.worker_pool import get_shared_executor
+
+# Taille de la fenêtre d'analyse d'énergie (ms)
+FRAME_MS = 20
+
+
+class LiveTranscriber:
+    """Transcription en direct d'un flux PCM (micro, pipe, stdin).
+
+    Les trames PCM sont accumulées et découpées aux pauses ; chaque segment terminé
+    est immédiatement envoyé au pool de workers. Un segment n'excède jamais
+    max_segment_s, ce qui borne la latence de bout en bout.
+    """
+
+    def __init__(self, converter, sample_rate: int = 16000, channels: int = 1, sample_width: int = 2,
+                 on_partial: Callable = None, pause_ms: int = 500, silence_threshold: float = 500.0,
+                 min_segment_s: float = 1.0, max_segment_s: float = 15.0, executor=None, language: str = None):
+        if sample_width != 2:
+            raise ValueError("Seul le PCM 16 bits est supporté")
+        self.converter = converter
+        self.language = language or converter.language
+        if self.language == AUTO_LANGUAGE:
+            # Chaque segment part dès la pause suivante : pas de passe de détection préalable
+            raise ValueError("Détection automatique de la langue non disponible en direct : préciser la langue")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.on_partial = on_partial
+        self.pause_ms = pause_ms
+        self.silence_threshold = silence_threshold
+        self.min_segment_s = min_segment_s
+        self.max_segment_s = max_segment_s
+        self.executor = executor or converter.executor or get_shared_executor()
+        self._frame_bytes = int(sample_rate * FRAME_MS / 1000) * channels * sample_width
+        self._buffer = bytearray()
+        self._analysed = 0          # octets du buffer déjà analysés
+        self._silent_ms = 0         # silence consécutif en fin de buffer
+        self._voiced = False        # le buffer contient de la parole
+        self._offset_bytes = 0      # position du début du buffer dans le flux
+        self._index = 0
+        self._futures = []
+        self._results = {}
+        self._lock = threading.Lock()
+        self.latencies: List[float] = []
+
+    @property
+    def _bytes_per_second(self):
+        return self.sample_rate * self.channels * self.sample_width
+
+    def feed(self, data: bytes):
+        """Ajoute des trames PCM brutes et découpe aux pauses détectées"""
+        self._buffer.extend(data)
+        while len(self._buffer) - self._analysed >= self._frame_bytes:
+            frame = self._buffer[self._analysed:self._analysed + self._frame_bytes]
+            self._analysed += self._frame_bytes
+            samples = np.frombuffer(frame, dtype='<i2').astype(np.float32)
+            rms = float(np.sqrt(np.mean(samples * samples))) if samples.size else 0.0
+            if rms < self.silence_threshold:
+                self._silent_ms += FRAME_MS
+            else:
+                self._silent_ms = 0
+                self._voiced = True
+            duration = self._analysed / self._bytes_per_second
+            at_pause = self._silent_ms >= self.pause_ms and duration >= self.min_segment_s
+            if duration >= self.max_segment_s or at_pause:
+                self._cut(self._analysed)
+
+    def _cut(self, length):
+        """Envoie les `length` premiers octets du buffer au pool de workers"""
+        pcm = bytes(self._buffer[:length])
+        del self._buffer[:length]
+        self._analysed -= length
+        start = self._offset_bytes / self._bytes_per_second
+        self._offset_bytes += length
+        end = self._offset_bytes / self._bytes_per_second
+        voiced = self._voiced
+        self._voiced = False
+        self._silent_ms = 0
+        if not voiced:
+            # Segment entièrement silencieux : inutile de solliciter la reconnaissance
+            return
+        self._index += 1
+        segment = PCMBuffer.from_bytes(pcm, self.sample_rate, self.channels)
+        submitted_at = time.monotonic()
+        self.converter.metrics.queue_depth.inc()
+        future = self.executor.submit(self.converter._run_segment, (segment, self._index, start, end),
+                                      self.language)
+        future.add_done_callback(lambda f, s=start, e=end, t=submitted_at: self._on_done(f, s, e, t))
+        self._futures.append(future)
+        logging.debug(f"Segment live {self._index} envoyé : {start:.1f}s - {end:.1f}s")
+
+    def _on_done(self, future, start, end, submitted_at):
+        try:
+            index, text = future.result()
+        except Exception as e:
+            logging.error(f"Erreur lors du traitement d'un segment live : {str(e)}")
+            return
+        latency = time.monotonic() - submitted_at
+        with self._lock:
+            self._results[index] = text
+            self.latencies.append(latency)
+        if self.on_partial:
+            self.on_partial(index, start, end, text)
+
+    def close(self) -> str:
+        """Envoie le reste du buffer, attend les segments en cours et retourne le texte complet"""
+        usable = len(self._buffer) - len(self._buffer) % (self.channels * self.sample_width)
+        if usable:
+            self._analysed = usable
+            self._cut(usable)
+        for future in self._futures:
+            future.result()
+        return self.transcript()
+
+    def transcript(self) -> str:
+        """Texte transcrit jusqu'ici, dans l'ordre des segments"""
+        with self._lock:
+            parts = [self._results[i] for i in sorted(self._results) if self._results[i]]
+        return self.converter.format_text(" ".join(parts))
+
+    def feed_stream(self, stream, chunk_ms: int = 100) -> str:
+        """Lit un flux binaire (PCM brut ou WAV) jusqu'à sa fin, puis retourne le texte complet"""
+        head = stream.read(4)
+        if head == b'RIFF':
+            self._read_wav_header(stream)
+        elif head:
+            self.feed(head)
+        chunk_bytes = int(self._bytes_per_second * chunk_ms / 1000)
+        while True:
+            data = stream.read(chunk_bytes)
+            if not data:
+                break
+            self.feed(data)
+        return self.close()
+
+    def _read_wav_header(self, stream):
+        """Lit l'en-tête WAV d'un flux (le 'RIFF' initial est déjà consommé)"""
+        stream.read(8)
+        while True:
+            chunk_id = stream.read(4)
+            size = int.from_bytes(stream.read(4), 'little')
+            if chunk_id == b'fmt ':
+                fmt = stream.read(size + (size & 1))
+                self.channels = int.from_bytes(fmt[2:4], 'little')
+                self.sample_rate = int.from_bytes(fmt[4:8], 'little')
+                if int.from_bytes(fmt[14:16], 'little') != 16:
+                    raise ValueError("Seul le WAV PCM 16 bits est supporté")
+                self._frame_bytes = int(self.sample_rate * FRAME_MS / 1000) * self.channels * self.sample_width
+            elif chunk_id == b'data' or not chunk_id:
+                return
+            else:
+                stream.read(size + (size & 1))
+
+
+def play_wav_realtime(wav_path: str, stream, speed: float = 1.0, chunk_ms: int = 100):
+    """Écrit un fichier WAV dans un flux au rythme du temps réel (pour les tests et démos)"""
+    with wave.open(wav_path, 'rb') as wf:
+        frames_per_chunk = int(wf.getframerate() * chunk_ms / 1000)
+        header = _wav_stream_header(wf.getnchannels(), wf.getsampwidth(), wf.getframerate())
+        stream.write(header)
+        start = time.monotonic()
+        sent = 0.0
+        while True:
+            data = wf.readframes(frames_per_chunk)
+            if not data:
+                break
+            stream.write(data)
+            stream.flush()
+            sent += chunk_ms / 1000 / speed
+            delay = start + sent - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+    stream.close()
+
+
+def _wav_stream_header(channels, sample_width, rate):
+    """En-tête WAV de taille inconnue (flux)"""
+    byte_rate = rate * channels * sample_width
+    return (b'RIFF' + (0xFFFFFFFF).to_bytes(4, 'little') + b'WAVE'
+            + b'fmt ' + (16).to_bytes(4, 'little') + (1).to_bytes(2, 'little')
+            + channels.to_bytes(2, 'little') + rate.to_bytes(4, 'little') + byte_rate.to_bytes(4, 'little')
+            + (channels * sample_width).to_bytes(2, 'little') + (sample_width * 8).to_bytes(2, 'little')
+            + b'data' + (0xFFFFFFFF).to_bytes(4, 'little'))
@@ -1,13 +1,18 @@
 import sys
 import os
+import time
 import logging
+import traceback
 from datetime import datetime
 from pathlib import Path
 
+# Référence pour mesurer le délai d'affichage de la fenêtre
+_STARTED_AT = time.perf_counter()
+
 # Ajouter le répertoire parent au chemin Python
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import Qt
 from src.main_window import MainWindow
 
@@ -79,6 +84,7 @@ def main():
         
         logging.debug("Affichage de la fenêtre")
         window.show()
+        logging.info(f"Fenêtre affichée {(time.perf_counter() - _STARTED_AT) * 1000:.0f} ms après le lancement")
         
         logging.debug("Démarrage de la boucle d'événements")
         return app.exec()
@@ -10,22 +10,31 @@ from PyQt6.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, QWidget, QFi
                             QTextEdit, QScrollArea, QComboBox, QMessageBox, QLabel, QProgressBar, QHBoxLayout)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QTextCursor
-from src.audio_converter import AudioConverter
+from src.languages import AUTO_LANGUAGE, SUPPORTED_LANGUAGES
+from src.job_queue import (JobQueue, JobQueueService, PRIORITY_INTERACTIVE,
+                           STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
 
 class ConversionThread(QThread):
     progress_updated = pyqtSignal(int)
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
     
-    def __init__(self, audio_path, language):
+    def __init__(self, audio_path, language, job_service=None):
         super().__init__()
         self.audio_path = audio_path
         self.language = language
+        self.job_service = job_service
+        self.job_id = None
         self.is_running = False
     
     def run(self):
         try:
             self.is_running = True
+            if self.job_service:
+                self._run_job()
+                return
+            # Chargé à la première conversion : pydub, speech_recognition et numpy ne retardent pas l'ouverture
+            from src.audio_converter import AudioConverter
             converter = AudioConverter()
             
             # Lancer la conversion
@@ -40,8 +49,31 @@ class ConversionThread(QThread):
         finally:
             self.is_running = False
     
+    def _run_job(self):
+        """Soumet le fichier à la file de jobs (priorité interactive) et suit son avancement"""
+        queue = self.job_service.queue
+        self.job_id = self.job_service.submit(self.audio_path, self.language, PRIORITY_INTERACTIVE)
+        last_progress = -1
+        while self.is_running:
+            job = queue.get(self.job_id)
+            if job['progress'] != last_progress:
+                last_progress = job['progress']
+                self.progress_updated.emit(last_progress)
+            if job['status'] == STATUS_DONE:
+                if job['result']:
+                    self.finished.emit(job['result'])
+                return
+            if job['status'] == STATUS_FAILED:
+                self.error.emit(f"Erreur lors de la conversion : {job['error']}")
+                return
+            if job['status'] == STATUS_CANCELLED:
+                return
+            self.msleep(200)
+    
     def stop(self):
         self.is_running = False
+        if self.job_service and self.job_id is not None:
+            self.job_service.cancel(self.job_id)
 
 class LogHandler(logging.Handler):
     def __init__(self, text_widget):
@@ -81,22 +113,8 @@ class LogHandler(logging.Handler):
             print(f"Erreur dans LogHandler.emit: {e}")
 
 class MainWindow(QMainWindow):
-    # Dictionnaire des langues supportées
-    SUPPORTED_LANGUAGES = {
-        'Français': 'fr-FR',
-        'English (US)': 'en-US',
-        'English (UK)': 'en-GB',
-        'Deutsch': 'de-DE',
-        'Español': 'es-ES',
-        'Italiano': 'it-IT',
-        'Nederlands': 'nl-NL',
-        'Polski': 'pl-PL',
-        'Português': 'pt-PT',
-        'Русский': 'ru-RU',
-        '日本語': 'ja-JP',
-        '한국어': 'ko-KR',
-        '中文': 'zh-CN'
-    }
+    # Dictionnaire des langues supportées, plus la détection automatique
+    SUPPORTED_LANGUAGES = {**SUPPORTED_LANGUAGES, 'Détection automatique': AUTO_LANGUAGE}
     
     def __init__(self):
         try:
@@ -107,7 +125,9 @@ class MainWindow(QMainWindow):
             
             # Initialiser les variables
             self.conversion_thread = None
-            self.converter = AudioConverter()
+            # File de jobs partagée avec la CLI, ouverte au premier fichier
+            self.job_queue = None
+            self.job_service = None
             
             logging.info("Création des widgets")
             self._create_widgets()
@@ -256,6 +276,13 @@ class MainWindow(QMainWindow):
             self.show_error_dialog("Erreur de création des widgets", str(e))
             raise
 
+    def _ensure_job_service(self):
+        """Ouvre la file de jobs et démarre un service qui n'exécute que les jobs de la fenêtre"""
+        if self.job_service is None:
+            self.job_queue = JobQueue()
+            self.job_service = JobQueueService(self.job_queue, own_jobs_only=True).start()
+        return self.job_service
+
     def update_progress(self, current):
         """Met à jour la barre de progression"""
         try:
@@ -313,7 +340,8 @@ class MainWindow(QMainWindow):
                     self.conversion_thread.wait()
                 
                 # Créer et démarrer le thread de conversion
-                self.conversion_thread = ConversionThread(file_path, selected_language)
+                self.conversion_thread = ConversionThread(file_path, selected_language,
+                                                          self._ensure_job_service())
                 self.conversion_thread.progress_updated.connect(self.update_progress)
                 self.conversion_thread.finished.connect(self.on_conversion_finished)
                 self.conversion_thread.error.connect(self.handle_error)
@@ -357,6 +385,9 @@ class MainWindow(QMainWindow):
                 logging.info("Arrêt du thread de conversion avant la fermeture")
                 self.conversion_thread.stop()
                 self.conversion_thread.wait()
+            if self.job_service:
+                self.job_service.stop()
+                self.job_queue.close()
             event.accept()
         except Exception as e:
             logging.error(f"Erreur lors de la fermeture de l'application: {str(e)}", exc_info=True)
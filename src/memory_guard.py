@@ -0,0 +1,125 @@
+import os
+import time
+import logging
+import threading
+
+try:
+    import psutil
+except ImportError:  # optionnel : /proc/self/statm sous Linux
+    psutil = None
+
+from src.metrics import CONVERTER_METRICS
+from src.system_utils import parse_size
+
+
+def current_rss():
+    """Mémoire résidente du processus en octets (None si elle ne peut pas être mesurée)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class MemoryGuard:
+    """Plafond de mémoire résidente (RSS) du processus.
+
+    Sous `soft_ratio` × plafond, la concurrence demandée est accordée ; au-delà elle
+    diminue linéairement jusqu'à un seul segment en vol au plafond. Sans plafond
+    (`max_rss` ou AUDIO2TEXT_MAX_RSS, ex. '2G'), la garde est inactive.
+    """
+
+    def __init__(self, max_rss=None, soft_ratio: float = 0.8, read_rss=None, metrics=None):
+        self.max_rss = parse_size(max_rss if max_rss is not None else os.environ.get('AUDIO2TEXT_MAX_RSS'))
+        self.soft_ratio = soft_ratio
+        self.read_rss = read_rss or current_rss
+        self.metrics = metrics or CONVERTER_METRICS
+        self._lock = threading.Lock()
+        self._reduced = False
+        if self.max_rss and self.read_rss() is None:
+            logging.warning("Mémoire du processus non mesurable (installer psutil) : plafond ignoré")
+            self.max_rss = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_rss)
+
+    def limit(self, concurrency: int) -> int:
+        """Nombre de segments en vol autorisés, compte tenu de la mémoire actuelle"""
+        if not self.max_rss:
+            return concurrency
+        rss = self.read_rss()
+        if rss is None:
+            return concurrency
+        soft = self.max_rss * self.soft_ratio
+        if rss <= soft:
+            allowed = concurrency
+        elif rss >= self.max_rss:
+            allowed = 1
+        else:
+            allowed = max(1, int(concurrency * (self.max_rss - rss) / (self.max_rss - soft)))
+        self.metrics.rss_bytes.set(rss)
+        self.metrics.concurrency_limit.set(allowed)
+        with self._lock:
+            reduced, self._reduced = self._reduced, allowed < concurrency
+        if allowed < concurrency and not reduced:
+            logging.warning(f"Mémoire à {rss / 2**20:.0f} Mo (plafond {self.max_rss / 2**20:.0f} Mo) : "
+                            f"concurrence réduite à {allowed}/{concurrency}")
+        elif reduced and allowed == concurrency:
+            logging.info(f"Mémoire à {rss / 2**20:.0f} Mo : concurrence rétablie à {concurrency}")
+        return allowed
+
+
+class AdaptiveSlots:
+    """Sémaphore dont la capacité suit la garde mémoire (relue à chaque tentative).
+
+    Une capacité réduite ne retire rien aux segments déjà en vol : les places se
+    libèrent au fil des fins de segments, sans en accorder de nouvelles.
+    """
+
+    def __init__(self, capacity: int, guard: MemoryGuard = None, recheck: float = 0.25):
+        self.capacity = capacity
+        self.guard = guard
+        self.recheck = recheck
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.lowest_limit = capacity
+        self._condition = threading.Condition()
+
+    def _limit(self):
+        limit = self.guard.limit(self.capacity) if self.guard else self.capacity
+        self.lowest_limit = min(self.lowest_limit, limit)
+        return limit
+
+    def acquire(self, timeout: float = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.in_use >= self._limit():
+                # Attente bornée : la mémoire peut redescendre sans qu'une place se libère
+                wait = self.recheck if deadline is None else min(self.recheck, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+                self._condition.wait(wait)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            return True
+
+    def release(self):
+        with self._condition:
+            self.in_use -= 1
+            self._condition.notify()
+
+
+_default_guard = None
+_default_lock = threading.Lock()
+
+
+def get_memory_guard() -> MemoryGuard:
+    """Garde partagée par le processus (plafond lu dans AUDIO2TEXT_MAX_RSS)"""
+    global _default_guard
+    with _default_lock:
+        if _default_guard is None:
+            _default_guard = MemoryGuard()
+        return _default_guard
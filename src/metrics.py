@@ -0,0 +1,280 @@
+import logging
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+# Bornes par défaut des histogrammes de latence (en secondes)
+DEFAULT_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(label_names, label_values, extra=None):
+    """Formate les labels au format texte Prometheus"""
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.extend(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    """Formate une valeur numérique (entiers sans décimale)"""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base commune des métriques : nom, aide, labels et verrou"""
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Labels invalides pour {self.name} : {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+    def _render_samples(self, items):
+        if not items and not self.labelnames:
+            items = [((), 0)]
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                for key, value in items]
+
+
+class Counter(_Metric):
+    """Compteur monotone"""
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Un compteur ne peut pas décroître")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Valeur instantanée pouvant monter et descendre"""
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Histogramme cumulatif à bornes fixes"""
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][i] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def get_count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state['count'] if state else 0
+
+    def _render_samples(self, items):
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['counts']):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(state["sum"])}')
+            lines.append(f'{self.name}_count{labels} {state["count"]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble de métriques exposées au format texte Prometheus"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames=(), **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is not None:
+                if not isinstance(metric, cls):
+                    raise ValueError(f"Métrique {name} déjà enregistrée avec un autre type")
+                return metric
+            metric = cls(name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Retourne toutes les métriques au format d'exposition texte"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class ConverterMetrics:
+    """Métriques du pipeline de conversion (convertisseur et pool de workers)"""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.queue_depth = registry.gauge(
+            'audio2text_queue_depth', "Segments soumis au pool et pas encore démarrés")
+        self.active_workers = registry.gauge(
+            'audio2text_active_workers', "Workers en train de traiter un segment")
+        self.segment_latency = registry.histogram(
+            'audio2text_segment_latency_seconds', "Durée de traitement d'un segment")
+        self.recognitions = registry.counter(
+            'audio2text_recognitions_total', "Résultats de reconnaissance par segment", ['result'])
+        self.conversions = registry.counter(
+            'audio2text_conversions_total', "Conversions de fichiers terminées", ['status'])
+        self.overlap_seconds = registry.counter(
+            'audio2text_overlap_audio_seconds_total', "Audio reconnu en double à cause du recouvrement")
+        self.temp_disk_bytes = registry.gauge(
+            'audio2text_temp_disk_bytes', "Espace disque occupé par les fichiers temporaires")
+        self.preprocess_latency = registry.histogram(
+            'audio2text_preprocess_seconds', "Durée du prétraitement d'un segment")
+        self.preprocess_segments = registry.counter(
+            'audio2text_preprocess_segments_total', "Segments prétraités par résultat", ['outcome'])
+        self.rss_bytes = registry.gauge(
+            'audio2text_rss_bytes', "Mémoire résidente du processus (mesurée si un plafond est configuré)")
+        self.concurrency_limit = registry.gauge(
+            'audio2text_concurrency_limit', "Segments en vol autorisés par job après la garde mémoire")
+
+
+# Registre par défaut, partagé par tous les convertisseurs du processus
+REGISTRY = MetricsRegistry()
+CONVERTER_METRICS = ConverterMetrics(REGISTRY)
+
+
+def _handler_class(registry):
+    """Gestionnaire HTTP de /metrics (http.server n'est importé qu'au démarrage du serveur)"""
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logging.debug(f"Métriques : {format % args}")
+
+    return MetricsHandler
+
+
+class MetricsServer:
+    """Serveur HTTP local exposant /metrics dans un thread en arrière-plan"""
+
+    def __init__(self, registry: MetricsRegistry = None, host: str = '127.0.0.1', port: int = 0):
+        self.registry = registry or REGISTRY
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self):
+        from http.server import ThreadingHTTPServer
+        self._server = ThreadingHTTPServer((self.host, self.port), _handler_class(self.registry))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+        logging.info(f"Serveur de métriques démarré sur {self.url}")
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            logging.info("Serveur de métriques arrêté")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def start_metrics_server(port: int = 0, host: str = '127.0.0.1', registry: MetricsRegistry = None) -> MetricsServer:
+    """Démarre le serveur de métriques et le retourne"""
+    return MetricsServer(registry, host, port).start()
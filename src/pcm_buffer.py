@@ -0,0 +1,267 @@
+import wave
+import threading
+
+import numpy as np
+import speech_recognition as sr
+
+# Format interne : PCM 16 bits signé, petit-boutiste
+SAMPLE_WIDTH = 2
+DTYPE = np.dtype('<i2')
+FULL_SCALE = 32768.0
+
+
+class PCMBuffer:
+    """Tampon audio PCM 16 bits adossé à un tableau NumPy (trames × canaux).
+
+    Le découpage (`buffer[début_ms:fin_ms]`, comme AudioSegment) retourne une vue
+    sans copie ; RMS, mixage, rééchantillonnage et gain sont vectorisés. pydub
+    n'intervient qu'aux bords (`from_audio_segment` / `to_audio_segment`).
+    """
+
+    sample_width = SAMPLE_WIDTH
+
+    def __init__(self, samples: np.ndarray, frame_rate: int):
+        if samples.ndim == 1:
+            samples = samples.reshape(-1, 1)
+        if samples.dtype != DTYPE:
+            raise ValueError(f"Échantillons 16 bits attendus, reçu {samples.dtype}")
+        self.samples = samples
+        self.frame_rate = frame_rate
+
+    @classmethod
+    def from_bytes(cls, data, frame_rate: int, channels: int = 1, sample_width: int = SAMPLE_WIDTH) -> 'PCMBuffer':
+        """Enveloppe des octets PCM sans les copier (16 bits) ou les convertit en 16 bits"""
+        usable = len(data) - len(data) % (channels * sample_width)
+        if sample_width == SAMPLE_WIDTH:
+            samples = np.frombuffer(data, dtype=DTYPE, count=usable // SAMPLE_WIDTH)
+        else:
+            samples = _to_int16(np.frombuffer(data, dtype=np.uint8, count=usable), sample_width)
+        return cls(samples.reshape(-1, channels), frame_rate)
+
+    @classmethod
+    def from_wav(cls, path) -> 'PCMBuffer':
+        """Charge un fichier WAV 16 bits (une seule lecture, sans passer par pydub)"""
+        with wave.open(str(path), 'rb') as wav_file:
+            if wav_file.getsampwidth() != SAMPLE_WIDTH:
+                raise ValueError(f"WAV 16 bits attendu : {path}")
+            channels = wav_file.getnchannels()
+            frame_rate = wav_file.getframerate()
+            data = wav_file.readframes(wav_file.getnframes())
+        return cls.from_bytes(data, frame_rate, channels)
+
+    @classmethod
+    def from_audio_segment(cls, segment) -> 'PCMBuffer':
+        """Conversion depuis pydub.AudioSegment (sans copie si le segment est déjà en 16 bits)"""
+        if segment.sample_width != SAMPLE_WIDTH:
+            segment = segment.set_sample_width(SAMPLE_WIDTH)
+        return cls.from_bytes(segment.raw_data, segment.frame_rate, segment.channels)
+
+    def to_audio_segment(self):
+        """Conversion vers pydub.AudioSegment, pour l'export dans d'autres formats"""
+        from pydub import AudioSegment
+        return AudioSegment(data=self.raw_data, sample_width=SAMPLE_WIDTH,
+                            frame_rate=self.frame_rate, channels=self.channels)
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def frame_count(self) -> int:
+        return self.samples.shape[0]
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frame_count / float(self.frame_rate)
+
+    @property
+    def nbytes(self) -> int:
+        return self.samples.nbytes
+
+    @property
+    def raw_data(self) -> bytes:
+        return np.ascontiguousarray(self.samples).tobytes()
+
+    def __len__(self) -> int:
+        """Durée en millisecondes, comme AudioSegment"""
+        return round(self.frame_count * 1000 / self.frame_rate)
+
+    def __getitem__(self, key) -> 'PCMBuffer':
+        """Découpe en millisecondes ; retourne une vue sur les mêmes échantillons"""
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("Seul le découpage `buffer[début_ms:fin_ms]` est supporté")
+        start = 0 if key.start is None else self._frame_at(key.start)
+        end = self.frame_count if key.stop is None else self._frame_at(key.stop)
+        return PCMBuffer(self.samples[start:end], self.frame_rate)
+
+    def _frame_at(self, ms):
+        return _frame_at(ms, self.frame_count, self.frame_rate)
+
+    def slice_seconds(self, start: float, end: float) -> 'PCMBuffer':
+        return self[start * 1000:end * 1000]
+
+    def shares_memory(self, other: 'PCMBuffer') -> bool:
+        return np.shares_memory(self.samples, other.samples)
+
+    def as_float(self) -> np.ndarray:
+        """Échantillons en float32 normalisés dans [-1, 1)"""
+        return self.samples.astype(np.float32) / FULL_SCALE
+
+    @classmethod
+    def from_float(cls, samples: np.ndarray, frame_rate: int) -> 'PCMBuffer':
+        """Inverse de as_float, avec écrêtage"""
+        scaled = np.clip(np.rint(samples * FULL_SCALE), -FULL_SCALE, FULL_SCALE - 1)
+        return cls(scaled.astype(DTYPE), frame_rate)
+
+    @property
+    def rms(self) -> float:
+        """Valeur efficace, en unités d'échantillon 16 bits"""
+        if not self.samples.size:
+            return 0.0
+        samples = self.samples.astype(np.float64)
+        return float(np.sqrt(np.mean(samples * samples)))
+
+    @property
+    def dbfs(self) -> float:
+        rms = self.rms
+        return 20 * np.log10(rms / FULL_SCALE) if rms else float('-inf')
+
+    def to_mono(self) -> 'PCMBuffer':
+        if self.channels == 1:
+            return self
+        mixed = self.samples.mean(axis=1, dtype=np.float32)
+        return PCMBuffer(np.rint(mixed).astype(DTYPE), self.frame_rate)
+
+    def resample(self, frame_rate: int) -> 'PCMBuffer':
+        """Rééchantillonnage par interpolation linéaire"""
+        if frame_rate == self.frame_rate or not self.frame_count:
+            return self
+        count = int(round(self.frame_count * frame_rate / self.frame_rate))
+        positions = np.arange(count) * (self.frame_rate / frame_rate)
+        source = np.arange(self.frame_count)
+        columns = [np.interp(positions, source, self.samples[:, c]) for c in range(self.channels)]
+        return PCMBuffer(np.rint(np.stack(columns, axis=1)).astype(DTYPE), frame_rate)
+
+    def apply_gain(self, gain_db: float) -> 'PCMBuffer':
+        factor = 10 ** (gain_db / 20)
+        return PCMBuffer.from_float(self.as_float() * factor, self.frame_rate)
+
+    def normalize(self, target_dbfs: float = -20.0, max_gain_db: float = 30.0) -> 'PCMBuffer':
+        """Ajuste le gain pour atteindre le niveau RMS cible (gain borné)"""
+        current = self.dbfs
+        if current == float('-inf'):
+            return self
+        return self.apply_gain(min(max_gain_db, target_dbfs - current))
+
+    def to_audio_data(self, frame_rate: int = None) -> sr.AudioData:
+        """Entrée directe du Recognizer (mono 16 bits), sans réencodage WAV"""
+        buffer = self.to_mono()
+        if frame_rate:
+            buffer = buffer.resample(frame_rate)
+        return sr.AudioData(buffer.raw_data, buffer.frame_rate, SAMPLE_WIDTH)
+
+
+class WavReader:
+    """Fichier WAV 16 bits lu à la demande, par fenêtres.
+
+    Se découpe comme un PCMBuffer (`reader[début_ms:fin_ms]`, mêmes bornes en
+    trames) mais retourne des fenêtres paresseuses : l'audio n'est lu du disque
+    qu'au chargement de chaque fenêtre, et seul ce qui est chargé occupe la mémoire.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._wav = wave.open(self.path, 'rb')
+        if self._wav.getsampwidth() != SAMPLE_WIDTH:
+            self._wav.close()
+            raise ValueError(f"WAV 16 bits attendu : {path}")
+        self.channels = self._wav.getnchannels()
+        self.frame_rate = self._wav.getframerate()
+        self.frame_count = self._wav.getnframes()
+        self._lock = threading.Lock()
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frame_count / float(self.frame_rate)
+
+    def __len__(self) -> int:
+        """Durée en millisecondes, comme PCMBuffer"""
+        return round(self.frame_count * 1000 / self.frame_rate)
+
+    def __getitem__(self, key) -> 'WavWindow':
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("Seul le découpage `reader[début_ms:fin_ms]` est supporté")
+        start = 0 if key.start is None else _frame_at(key.start, self.frame_count, self.frame_rate)
+        end = self.frame_count if key.stop is None else _frame_at(key.stop, self.frame_count, self.frame_rate)
+        return WavWindow(self, start, max(start, end))
+
+    def read_frames(self, start: int, end: int) -> PCMBuffer:
+        """Lit les trames [start, end) dans un tampon indépendant du fichier"""
+        with self._lock:
+            self._wav.setpos(start)
+            data = self._wav.readframes(end - start)
+        return PCMBuffer.from_bytes(data, self.frame_rate, self.channels)
+
+    def close(self):
+        self._wav.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class WavWindow:
+    """Fenêtre d'un WavReader, chargée par load() (voir as_pcm_buffer)"""
+
+    def __init__(self, reader: WavReader, start: int, end: int):
+        self.reader = reader
+        self.start = start
+        self.end = end
+
+    @property
+    def duration_seconds(self) -> float:
+        return (self.end - self.start) / float(self.reader.frame_rate)
+
+    def __len__(self) -> int:
+        return round((self.end - self.start) * 1000 / self.reader.frame_rate)
+
+    def __getitem__(self, key) -> 'WavWindow':
+        """Sous-fenêtre `window[début_ms:fin_ms]`, positions relatives au début de la fenêtre"""
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("Seul le découpage `window[début_ms:fin_ms]` est supporté")
+        count, rate = self.end - self.start, self.reader.frame_rate
+        start = 0 if key.start is None else _frame_at(key.start, count, rate)
+        end = count if key.stop is None else _frame_at(key.stop, count, rate)
+        return WavWindow(self.reader, self.start + start, self.start + max(start, end))
+
+    def load(self) -> PCMBuffer:
+        return self.reader.read_frames(self.start, self.end)
+
+
+def _frame_at(ms, frame_count, frame_rate):
+    """Trame correspondant à une position en millisecondes (négative : depuis la fin)"""
+    if ms < 0:
+        ms += round(frame_count * 1000 / frame_rate)
+    return min(frame_count, max(0, int(ms * frame_rate / 1000)))
+
+
+def _to_int16(raw: np.ndarray, sample_width: int) -> np.ndarray:
+    """Convertit des échantillons PCM 8, 24 ou 32 bits en 16 bits (octets de poids fort)"""
+    if sample_width == 1:
+        # PCM 8 bits non signé
+        return ((raw.astype(np.int16) - 128) << 8).astype(DTYPE)
+    if sample_width in (3, 4):
+        frames = raw.reshape(-1, sample_width)
+        return frames[:, -2:].copy().view(DTYPE).reshape(-1)
+    raise ValueError(f"Largeur d'échantillon non supportée : {sample_width}")
+
+
+def as_pcm_buffer(audio) -> PCMBuffer:
+    """Accepte un PCMBuffer, une fenêtre de WavReader (lue ici) ou un AudioSegment (compatibilité)"""
+    if isinstance(audio, PCMBuffer):
+        return audio
+    if isinstance(audio, WavWindow):
+        return audio.load()
+    return PCMBuffer.from_audio_segment(audio)
@@ -0,0 +1,183 @@
+import time
+import logging
+import threading
+
+import numpy as np
+
+from src.metrics import CONVERTER_METRICS
+from src.pcm_buffer import PCMBuffer
+
+# Fenêtre d'analyse du noise gate (ms)
+GATE_FRAME_MS = 20
+# Lissage des transitions du gate, pour éviter les clics (ms)
+GATE_SMOOTH_MS = 5
+# Percentile des niveaux de trames retenu comme bruit de fond du segment
+NOISE_FLOOR_PERCENTILE = 10
+
+
+def _dbfs(rms):
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def high_pass(samples: np.ndarray, frame_rate: int, cutoff_hz: float) -> np.ndarray:
+    """Filtre passe-haut dans le domaine fréquentiel (transition en cosinus sur une octave)"""
+    count = samples.shape[0]
+    if cutoff_hz <= 0 or count < 2:
+        return samples
+    # Bourrage de zéros : la fin du segment ne doit pas déborder sur son début (FFT circulaire)
+    size = 1 << int(np.ceil(np.log2(count + int(4 * frame_rate / cutoff_hz))))
+    spectrum = np.fft.rfft(samples, n=size, axis=0)
+    freqs = np.fft.rfftfreq(size, 1.0 / frame_rate)
+    ramp = np.clip((freqs - cutoff_hz / 2) / (cutoff_hz / 2), 0.0, 1.0)
+    gain = 0.5 - 0.5 * np.cos(np.pi * ramp)
+    return np.fft.irfft(spectrum * gain[:, None], n=size, axis=0)[:count].astype(np.float32)
+
+
+def frame_levels(samples: np.ndarray, frame_rate: int) -> np.ndarray:
+    """Niveau (dBFS) de chaque trame de GATE_FRAME_MS"""
+    frame = max(1, int(frame_rate * GATE_FRAME_MS / 1000))
+    frames = -(-samples.shape[0] // frame)
+    padded = np.zeros((frames * frame, samples.shape[1]), dtype=np.float32)
+    padded[:samples.shape[0]] = samples
+    return _dbfs(np.sqrt(np.mean(padded.reshape(frames, -1) ** 2, axis=1)))
+
+
+def gate_mask(levels: np.ndarray, margin_db: float, silence_dbfs: float) -> np.ndarray:
+    """Trames ouvertes : au moins `margin_db` au-dessus du bruit de fond du segment.
+
+    Le bruit de fond est un bas percentile des niveaux de trames : le seuil suit le
+    segment, un enregistrement faible mais propre n'est pas coupé. Sans écart suffisant
+    entre bruit de fond et passages forts, rien n'est atténué. Les trames proches du
+    silence numérique (sous `silence_dbfs`) restent fermées ; chaque trame ouverte est
+    élargie d'une trame de chaque côté.
+    """
+    floor = np.percentile(levels, NOISE_FLOOR_PERCENTILE)
+    if levels.max() - floor < margin_db:
+        is_open = levels >= silence_dbfs
+    else:
+        is_open = (levels >= floor + margin_db) & (levels >= silence_dbfs)
+    # Maintien : ne pas couper les attaques et fins de mots
+    return np.convolve(is_open, np.ones(3), mode='same') > 0
+
+
+class PreprocessStats:
+    """Compteurs de prétraitement (un job, ou le cumul d'un préprocesseur)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {'segments': 0, 'skipped_silent': 0, 'quiet': 0, 'rescued': 0, 'seconds': 0.0}
+
+    def record(self, elapsed: float, skipped: bool = False, quiet: bool = False):
+        with self._lock:
+            self._stats['segments'] += 1
+            self._stats['seconds'] += elapsed
+            self._stats['skipped_silent'] += skipped
+            self._stats['quiet'] += quiet
+
+    def record_rescued(self):
+        with self._lock:
+            self._stats['rescued'] += 1
+
+    def summary(self) -> dict:
+        """Compteurs et coût moyen par segment"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['ms_per_segment'] = stats['seconds'] * 1000 / stats['segments'] if stats['segments'] else 0.0
+        return stats
+
+    def log_summary(self) -> dict:
+        stats = self.summary()
+        logging.info(f"Prétraitement : {stats['segments']} segments, {stats['skipped_silent']} silencieux "
+                     f"non envoyés, {stats['rescued']} segments faibles sauvés, "
+                     f"{stats['ms_per_segment']:.1f} ms par segment")
+        return stats
+
+
+class AudioPreprocessor:
+    """Prétraitement vectorisé des segments avant la reconnaissance.
+
+    Enchaîne un passe-haut (bruit de fond grave), un noise gate par trames relatif au
+    bruit de fond du segment et une normalisation du gain sur les passages ouverts.
+    Seul un segment proche du silence numérique (toutes les trames sous
+    `silence_dbfs`) n'est pas envoyé à la reconnaissance.
+
+    Un segment « sauvé » est un segment faible (niveau brut sous `quiet_dbfs`) qui
+    obtient un texte après prétraitement. Avec `verify_raw`, l'audio brut de ces
+    segments est aussi soumis au backend et seuls ceux qu'il ne reconnaît pas sont
+    comptés : mesure exacte, au prix d'une requête supplémentaire par segment faible.
+
+    Le préprocesseur peut servir plusieurs conversions à la fois : chacune passe ses
+    propres PreprocessStats, `totals` cumule tous les segments.
+    """
+
+    def __init__(self, high_pass_hz: float = 80.0, gate_margin_db: float = 10.0, silence_dbfs: float = -70.0,
+                 gate_floor_db: float = -30.0, target_dbfs: float = -20.0, max_gain_db: float = 30.0,
+                 quiet_dbfs: float = -35.0,
+                 verify_raw: bool = False, metrics=None):
+        self.high_pass_hz = high_pass_hz
+        self.gate_margin_db = gate_margin_db
+        self.silence_dbfs = silence_dbfs
+        self.gate_floor_db = gate_floor_db
+        self.target_dbfs = target_dbfs
+        self.max_gain_db = max_gain_db
+        self.quiet_dbfs = quiet_dbfs
+        self.verify_raw = verify_raw
+        self.metrics = metrics or CONVERTER_METRICS
+        self.totals = PreprocessStats()
+
+    def process(self, buffer: PCMBuffer, stats: PreprocessStats = None):
+        """Retourne (segment prétraité ou None s'il est entièrement silencieux, segment faible ?)
+
+        Le segment est aussi compté dans `stats` (statistiques du job) si elles sont données.
+        """
+        start = time.perf_counter()
+        mono = buffer.to_mono()
+        quiet = bool(mono.dbfs < self.quiet_dbfs)
+        if not mono.frame_count:
+            self._account(start, stats, skipped=True, quiet=quiet)
+            return None, quiet
+        samples = high_pass(mono.as_float().reshape(-1, 1), mono.frame_rate, self.high_pass_hz)
+        mask = gate_mask(frame_levels(samples, mono.frame_rate), self.gate_margin_db, self.silence_dbfs)
+        if not mask.any():
+            self._account(start, stats, skipped=True, quiet=quiet)
+            return None, quiet
+
+        # Gain du gate par échantillon, lissé pour éviter les clics
+        frame = max(1, int(mono.frame_rate * GATE_FRAME_MS / 1000))
+        floor = 10 ** (self.gate_floor_db / 20)
+        gains = np.repeat(np.where(mask, 1.0, floor).astype(np.float32), frame)[:samples.shape[0]]
+        smooth = max(1, int(mono.frame_rate * GATE_SMOOTH_MS / 1000))
+        if gains.shape[0] > smooth:
+            gains = np.convolve(gains, np.full(smooth, 1.0 / smooth, dtype=np.float32), mode='same')
+        samples = samples[:, 0] * gains
+
+        # Normalisation sur les passages ouverts uniquement (le silence ne dilue pas le niveau)
+        voiced = samples[np.repeat(mask, frame)[:samples.shape[0]]]
+        level = float(_dbfs(np.sqrt(np.mean(voiced * voiced))))
+        gain_db = min(self.max_gain_db, self.target_dbfs - level)
+        processed = PCMBuffer.from_float(samples * 10 ** (gain_db / 20), mono.frame_rate)
+        self._account(start, stats, quiet=quiet)
+        return processed, quiet
+
+    def _account(self, start, stats, skipped=False, quiet=False):
+        elapsed = time.perf_counter() - start
+        self.metrics.preprocess_latency.observe(elapsed)
+        self.metrics.preprocess_segments.inc(outcome='skipped_silent' if skipped else 'processed')
+        self.totals.record(elapsed, skipped, quiet)
+        if stats is not None:
+            stats.record(elapsed, skipped, quiet)
+
+    def record_result(self, quiet: bool, text: str, recognize_raw=None, stats: PreprocessStats = None):
+        """Comptabilise un segment sauvé ; recognize_raw() retourne le texte obtenu sans prétraitement"""
+        if not (quiet and text):
+            return
+        if self.verify_raw and recognize_raw is not None and recognize_raw():
+            return
+        self.metrics.preprocess_segments.inc(outcome='rescued')
+        self.totals.record_rescued()
+        if stats is not None:
+            stats.record_rescued()
+
+    def summary(self) -> dict:
+        """Statistiques cumulées de tous les segments prétraités, coût moyen par segment inclus"""
+        return self.totals.summary()
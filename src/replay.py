@@ -0,0 +1,234 @@
+import re
+import json
+import time
+import hashlib
+import logging
+import datetime
+import threading
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import speech_recognition as sr
+
+from src.pcm_buffer import PCMBuffer
+
+FORMAT = 'audio2text-replay'
+VERSION = 1
+
+# Lignes du journal de l'application exploitées par Recording.from_log
+_LOG_LINE = re.compile(r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) - \w+ - (?:\[[^\]]*\] - )?(.*)$')
+_SEGMENT_CREATED = re.compile(r'Segment créé: ([\d.]+)s - ([\d.]+)s')
+_ATTEMPT = re.compile(r'Segment (\d+)/\d+: Tentative 1 de reconnaissance')
+_SUCCESS = re.compile(r'Segment (\d+)/\d+: Reconnaissance réussie \((\d+) caractères\)')
+_UNKNOWN = re.compile(r'Segment (\d+)/\d+: Audio incompréhensible')
+_REQUEST_ERROR = re.compile(r'Segment (\d+)/\d+: Erreur API')
+
+
+def audio_hash(audio: sr.AudioData) -> str:
+    """Empreinte du contenu PCM transmis au backend"""
+    return hashlib.sha1(audio.get_raw_data()).hexdigest()
+
+
+def _placeholder_text(length: int, seed: int) -> str:
+    """Texte factice déterministe d'environ `length` caractères"""
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append(f"mot{(seed * 7919 + len(words)) % 10000:04d}")
+    return ' '.join(words)[:max(length, 0)].strip()
+
+
+class Recording:
+    """Réponses enregistrées du backend de reconnaissance (une ligne JSON par segment).
+
+    Chaque enregistrement contient l'empreinte de l'audio, la langue, la durée du
+    segment, la latence mesurée, le résultat (success, unknown_value, request_error)
+    et le texte retourné.
+    """
+
+    def __init__(self, records: List[dict] = None, meta: dict = None):
+        self.records = records or []
+        self.meta = meta or {}
+        self._lock = threading.Lock()
+
+    def add(self, record: dict):
+        with self._lock:
+            self.records.append(record)
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            lines = [json.dumps({'format': FORMAT, 'version': VERSION, **self.meta})]
+            lines += [json.dumps(record, ensure_ascii=False) for record in self.records]
+        path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        logging.info(f"Enregistrement de {len(self.records)} réponses : {path}")
+
+    @classmethod
+    def load(cls, path) -> 'Recording':
+        lines = [line for line in Path(path).read_text(encoding='utf-8').splitlines() if line.strip()]
+        meta = json.loads(lines[0]) if lines else {}
+        if meta.get('format') != FORMAT:
+            raise ValueError(f"Fichier d'enregistrement invalide : {path}")
+        meta.pop('format')
+        meta.pop('version', None)
+        return cls([json.loads(line) for line in lines[1:]], meta)
+
+    @classmethod
+    def from_log(cls, log_path, run: int = -1, language: str = 'fr-FR', sample_rate: int = 16000) -> 'Recording':
+        """Reconstitue les latences d'une conversion à partir du journal de l'application.
+
+        Le journal ne contient ni l'audio ni les textes : un audio synthétique déterministe
+        (voir synthetic_audio) est associé aux segments, et les textes sont remplacés par
+        des mots factices de même longueur.
+        """
+        runs = []
+        for line in Path(log_path).read_text(encoding='utf-8', errors='replace').splitlines():
+            match = _LOG_LINE.match(line)
+            if not match:
+                continue
+            when = datetime.datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S,%f').timestamp()
+            message = match.group(2)
+            created = _SEGMENT_CREATED.search(message)
+            if created:
+                if not runs or runs[-1]['attempts']:
+                    runs.append({'segments': [], 'attempts': {}, 'results': {}})
+                runs[-1]['segments'].append((float(created.group(1)), float(created.group(2))))
+                continue
+            if not runs:
+                continue
+            attempt = _ATTEMPT.search(message)
+            if attempt:
+                runs[-1]['attempts'].setdefault(int(attempt.group(1)), when)
+                continue
+            for pattern, outcome in ((_SUCCESS, 'success'), (_UNKNOWN, 'unknown_value'),
+                                     (_REQUEST_ERROR, 'request_error')):
+                result = pattern.search(message)
+                if result:
+                    length = int(result.group(2)) if outcome == 'success' else 0
+                    runs[-1]['results'].setdefault(int(result.group(1)), (when, outcome, length))
+                    break
+        complete = [r for r in runs if r['results'] and set(r['results']) <= set(r['attempts'])]
+        if not complete:
+            raise ValueError(f"Aucune conversion exploitable dans {log_path}")
+        chosen = complete[run]
+
+        # Numérotation des segments à partir de 0 ou de 1 selon la version de l'application
+        first = min(chosen['attempts'])
+        meta = {'source': str(log_path), 'synthetic': {'sample_rate': sample_rate,
+                                                      'segments': chosen['segments']}}
+        recording = cls(meta=meta)
+        audio = recording.synthetic_audio()
+        for position, (start, end) in enumerate(chosen['segments']):
+            index = position + first
+            if index not in chosen['results']:
+                continue
+            finished, outcome, length = chosen['results'][index]
+            recording.add({
+                'hash': audio_hash(audio[start * 1000:end * 1000].to_audio_data()),
+                'language': language,
+                'duration': end - start,
+                'latency': max(0.0, finished - chosen['attempts'][index]),
+                'outcome': outcome,
+                'text': _placeholder_text(length, position),
+            })
+        return recording
+
+    def synthetic_audio(self) -> PCMBuffer:
+        """Audio déterministe (bruit, une graine par segment) associé à un enregistrement issu d'un journal"""
+        synthetic = self.meta.get('synthetic')
+        if not synthetic:
+            raise ValueError("Cet enregistrement ne provient pas d'un journal")
+        rate = synthetic['sample_rate']
+        parts = []
+        for position, (start, end) in enumerate(synthetic['segments']):
+            frames = int(round(end * rate)) - int(round(start * rate))
+            rng = np.random.default_rng(position + 1)
+            parts.append(rng.integers(-2000, 2000, frames, dtype=np.int16))
+        return PCMBuffer(np.concatenate(parts).astype('<i2'), rate)
+
+
+class RecordingBackend:
+    """Enveloppe un backend de reconnaissance et enregistre chaque réponse et sa latence"""
+
+    def __init__(self, backend, recording: Recording = None, path=None):
+        self.backend = backend
+        self.recording = recording or Recording()
+        self.path = path
+
+    def __call__(self, recognizer, audio, language):
+        record = {'hash': audio_hash(audio), 'language': language,
+                  'duration': len(audio.get_raw_data()) / float(audio.sample_rate * audio.sample_width)}
+        start = time.perf_counter()
+        try:
+            text = self.backend(recognizer, audio, language)
+        except sr.UnknownValueError:
+            self._add(record, start, 'unknown_value', '')
+            raise
+        except sr.RequestError as e:
+            self._add(record, start, 'request_error', str(e))
+            raise
+        self._add(record, start, 'success', text)
+        return text
+
+    def _add(self, record, start, outcome, text):
+        record.update(latency=time.perf_counter() - start, outcome=outcome, text=text)
+        self.recording.add(record)
+
+    def save(self, path=None):
+        self.recording.save(path or self.path)
+
+
+class ReplayBackend:
+    """Rejoue un enregistrement hors ligne, avec les mêmes latences et les mêmes réponses.
+
+    Les segments sont retrouvés par l'empreinte de leur audio. Un segment absent de
+    l'enregistrement (découpage différent) reçoit la réponse d'un segment enregistré
+    de durée voisine, choisi à partir de son empreinte : le rejeu reste déterministe
+    et suit la même distribution de latences. `speed` accélère le rejeu (2.0 : deux
+    fois plus vite) sans changer l'ordre relatif des fins de segments.
+    """
+
+    def __init__(self, recording: Recording, speed: float = 1.0):
+        self.recording = recording
+        self.speed = speed
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._by_hash = {}
+        self._cursor = {}
+        for record in recording.records:
+            self._by_hash.setdefault(record['hash'], []).append(record)
+        self._by_duration = sorted(recording.records, key=lambda record: record['duration'])
+        if not self._by_duration:
+            raise ValueError("Enregistrement vide")
+
+    def _lookup(self, digest, duration):
+        with self._lock:
+            records = self._by_hash.get(digest)
+            if records:
+                # Un même audio enregistré plusieurs fois : réponses rejouées dans l'ordre
+                position = self._cursor.get(digest, 0)
+                self._cursor[digest] = position + 1
+                self.hits += 1
+                return records[position % len(records)], 1.0
+            self.misses += 1
+        durations = [record['duration'] for record in self._by_duration]
+        nearest = int(np.searchsorted(durations, duration))
+        low, high = max(0, nearest - 2), min(len(durations), nearest + 2)
+        candidates = self._by_duration[low:high] or self._by_duration[-1:]
+        record = candidates[int(digest[:8], 16) % len(candidates)]
+        scale = duration / record['duration'] if record['duration'] else 1.0
+        return record, scale
+
+    def __call__(self, recognizer, audio, language):
+        duration = len(audio.get_raw_data()) / float(audio.sample_rate * audio.sample_width)
+        record, scale = self._lookup(audio_hash(audio), duration)
+        latency = record['latency'] * scale / self.speed
+        if latency > 0:
+            time.sleep(latency)
+        if record['outcome'] == 'unknown_value':
+            raise sr.UnknownValueError()
+        if record['outcome'] == 'request_error':
+            raise sr.RequestError(record['text'] or "erreur rejouée")
+        return record['text']
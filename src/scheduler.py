@@ -0,0 +1,61 @@
+from typing import List, Sequence
+
+from src.pcm_buffer import as_pcm_buffer
+
+# Sondes courtes réparties dans chaque segment pour estimer sa part de parole
+SPEECH_PROBES = 16
+PROBE_MS = 100
+# Niveau au-dessus duquel une sonde est comptée comme parole
+SPEECH_DBFS = -45.0
+
+
+def speech_ratio(segment, probes: int = SPEECH_PROBES, probe_ms: int = PROBE_MS) -> float:
+    """Part des sondes du segment dont le niveau dépasse SPEECH_DBFS (0 : silence).
+
+    Seules les sondes sont lues : une fenêtre de WavReader n'est pas chargée en entier.
+    """
+    duration_ms = len(segment)
+    if duration_ms <= 0:
+        return 0.0
+    step = duration_ms / probes
+    voiced = measured = 0
+    for i in range(probes):
+        start = int(i * step + max(0.0, step - probe_ms) / 2)
+        probe = as_pcm_buffer(segment[start:start + probe_ms])
+        if not probe.frame_count:
+            continue
+        measured += 1
+        voiced += probe.to_mono().dbfs > SPEECH_DBFS
+    return voiced / measured if measured else 0.0
+
+
+def estimate_cost(segment_data) -> float:
+    """Coût estimé d'un segment : secondes de parole qu'il contient.
+
+    La latence de reconnaissance suit la parole plutôt que la durée brute : un segment
+    silencieux est écarté par le prétraitement ou répond vite sans résultat.
+    """
+    segment, _, start, end = segment_data
+    return (end - start) * speech_ratio(segment)
+
+
+def schedule_segments(segments: Sequence) -> List:
+    """Ordonne les segments par coût estimé décroissant (longest processing time first).
+
+    Avec un pool dont chaque worker libre prend la tâche suivante, cet ordre répartit
+    la charge et évite qu'un segment chargé démarre en dernier et allonge la fin du job.
+    Les segments d'un fichier ont presque tous la même durée : c'est la part de parole
+    qui les départage, puis la durée ; le tri stable garde l'ordre chronologique à égalité.
+    """
+    costs = {id(seg): (estimate_cost(seg), seg[3] - seg[2]) for seg in segments}
+    return sorted(segments, key=lambda seg: costs[id(seg)], reverse=True)
+
+
+def straggler_tail(completion_times: Sequence[float], workers: int) -> float:
+    """Durée pendant laquelle au moins un worker reste inactif en fin de job"""
+    if not completion_times:
+        return 0.0
+    times = sorted(completion_times)
+    # Après la (N - W + 1)e fin de segment, la file est vide et un worker est inoccupé
+    first_idle = times[max(0, len(times) - workers)]
+    return times[-1] - first_idle
@@ -0,0 +1,191 @@
+import os
+import re
+import uuid
+import atexit
+import shutil
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+from src.metrics import CONVERTER_METRICS
+from src.system_utils import parse_size, pid_alive
+
+# Préfixe des entrées créées par Audio2Text dans le répertoire de travail
+ENTRY_PREFIX = 'a2t-'
+_ENTRY_RE = re.compile(rf'^{ENTRY_PREFIX}(\d+)-')
+
+
+class ScratchQuotaExceeded(Exception):
+    """Levée quand un fichier temporaire dépasserait le budget disque"""
+
+
+class ScratchManager:
+    """Répertoire de travail avec budget disque et nettoyage garanti.
+
+    Chaque job obtient son propre sous-dossier, supprimé en sortie de contexte.
+    Les entrées sont préfixées par le PID du processus : au démarrage, celles
+    dont le processus n'existe plus (crash, kill -9) sont supprimées.
+    """
+
+    def __init__(self, root=None, quota_bytes=None, sweep: bool = True, metrics=None):
+        root = root or os.environ.get('AUDIO2TEXT_SCRATCH_DIR')
+        self.root = Path(root) if root else Path(tempfile.gettempdir()) / 'audio2text-scratch'
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.quota_bytes = parse_size(quota_bytes if quota_bytes is not None
+                                      else os.environ.get('AUDIO2TEXT_SCRATCH_QUOTA'))
+        self.metrics = metrics or CONVERTER_METRICS
+        self._lock = threading.Lock()
+        self._sizes = {}
+        self._active = set()
+        if sweep:
+            self.sweep_orphans()
+        atexit.register(self.cleanup_all)
+        logging.info(f"Répertoire de travail : {self.root} (quota : {self.quota_bytes or 'illimité'})")
+
+    @property
+    def usage(self) -> int:
+        """Octets actuellement occupés par les fichiers suivis"""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def remaining(self):
+        """Octets encore disponibles dans le budget (None si illimité)"""
+        if self.quota_bytes is None:
+            return None
+        return max(0, self.quota_bytes - self.usage)
+
+    def _entry_name(self, kind):
+        return f"{ENTRY_PREFIX}{os.getpid()}-{kind}-{uuid.uuid4().hex[:12]}"
+
+    def reserve(self, path, expected_size: int):
+        """Vérifie que `expected_size` octets tiennent dans le budget et les réserve pour `path`"""
+        path = str(path)
+        with self._lock:
+            used = sum(size for p, size in self._sizes.items() if p != path)
+            if self.quota_bytes is not None and used + expected_size > self.quota_bytes:
+                raise ScratchQuotaExceeded(
+                    f"Budget disque temporaire dépassé ({used + expected_size} > {self.quota_bytes} octets)")
+            self._sizes[path] = expected_size
+        self._update_metrics()
+
+    def account(self, path):
+        """Enregistre la taille réelle d'un fichier écrit ; le supprime s'il dépasse le budget"""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        try:
+            self.reserve(path, size)
+        except ScratchQuotaExceeded:
+            self.release(path)
+            raise
+
+    def release(self, path):
+        """Supprime un fichier temporaire et libère sa part du budget"""
+        path = str(path)
+        with self._lock:
+            self._sizes.pop(path, None)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        self._update_metrics()
+
+    def _forget_dir(self, directory):
+        prefix = str(directory) + os.sep
+        with self._lock:
+            for path in [p for p in self._sizes if p.startswith(prefix)]:
+                del self._sizes[path]
+        self._update_metrics()
+
+    def _update_metrics(self):
+        self.metrics.temp_disk_bytes.set(self.usage)
+
+    def new_file(self, suffix='', directory=None) -> str:
+        """Crée un fichier vide suivi par le gestionnaire et retourne son chemin"""
+        directory = Path(directory) if directory else self.root
+        path = directory / (self._entry_name('file') + suffix)
+        path.touch()
+        self.reserve(path, 0)
+        return str(path)
+
+    @contextmanager
+    def job(self):
+        """Contexte fournissant un répertoire de travail propre à un job"""
+        directory = self.root / self._entry_name('job')
+        directory.mkdir()
+        with self._lock:
+            self._active.add(directory)
+        try:
+            yield JobScratch(self, directory)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+            self._forget_dir(directory)
+            with self._lock:
+                self._active.discard(directory)
+
+    def cleanup_all(self):
+        """Supprime tous les répertoires de jobs encore actifs (arrêt du processus)"""
+        with self._lock:
+            active = list(self._active)
+            self._active.clear()
+        for directory in active:
+            shutil.rmtree(directory, ignore_errors=True)
+            self._forget_dir(directory)
+
+    def sweep_orphans(self) -> int:
+        """Supprime les entrées laissées par des processus qui n'existent plus"""
+        removed = 0
+        for entry in self.root.iterdir():
+            match = _ENTRY_RE.match(entry.name)
+            if not match or pid_alive(int(match.group(1))):
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                try:
+                    entry.unlink()
+                except FileNotFoundError:
+                    pass
+            removed += 1
+        if removed:
+            logging.warning(f"{removed} fichier(s) temporaire(s) orphelin(s) supprimé(s) dans {self.root}")
+        return removed
+
+
+class JobScratch:
+    """Répertoire de travail d'un job, nettoyé par ScratchManager.job()"""
+
+    def __init__(self, manager: ScratchManager, directory: Path):
+        self.manager = manager
+        self.directory = directory
+
+    def new_file(self, suffix='') -> str:
+        return self.manager.new_file(suffix, self.directory)
+
+    def reserve(self, path, expected_size):
+        self.manager.reserve(path, expected_size)
+
+    def account(self, path):
+        self.manager.account(path)
+
+    def release(self, path):
+        self.manager.release(path)
+
+    def remaining(self):
+        return self.manager.remaining()
+
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+
+def get_scratch_manager() -> ScratchManager:
+    """Gestionnaire partagé par le processus (créé au premier appel, avec balayage des orphelins)"""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = ScratchManager()
+        return _default_manager
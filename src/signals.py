@@ -0,0 +1,54 @@
+import logging
+import threading
+
+
+class Signal:
+    """Signal minimal (connect / disconnect / emit) sans dépendance à Qt.
+
+    Les callbacks sont appelés dans le thread qui émet ; une interface Qt qui s'y
+    connecte doit relayer vers son propre thread (signal Qt ou file d'événements).
+    """
+
+    def __init__(self, *types):
+        self.types = types
+        self._slots = []
+        self._lock = threading.Lock()
+
+    def connect(self, slot):
+        with self._lock:
+            self._slots.append(slot)
+
+    def disconnect(self, slot=None):
+        with self._lock:
+            if slot is None:
+                self._slots.clear()
+            else:
+                self._slots.remove(slot)
+
+    def emit(self, *args):
+        with self._lock:
+            slots = list(self._slots)
+        for slot in slots:
+            try:
+                slot(*args)
+            except Exception as e:
+                logging.error(f"Erreur dans un callback de signal : {str(e)}")
+
+
+class SignalDescriptor:
+    """Déclaration au niveau de la classe, comme pyqtSignal : un Signal par instance"""
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        signal = instance.__dict__.get(self.name)
+        if signal is None:
+            signal = instance.__dict__.setdefault(self.name, Signal(*self.types))
+        return signal
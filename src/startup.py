@@ -0,0 +1,62 @@
+import re
+import sys
+import subprocess
+from collections import defaultdict
+from typing import List, NamedTuple
+
+# Modules dont le temps de chargement est surveillé
+DEFAULT_MODULES = ['src.main_window', 'src.cli', 'src.audio_converter']
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportEntry]:
+    """Analyse la sortie de `python -X importtime`"""
+    entries = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def import_report(module: str, python: str = None) -> dict:
+    """Temps d'import de `module` dans un interpréteur neuf, ventilé par paquet de premier niveau"""
+    result = subprocess.run([python or sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Import de {module} impossible : {result.stderr.strip().splitlines()[-1]}")
+    # Sortie en post-ordre : le sous-arbre du module précède sa propre ligne de profondeur 0
+    subtree = []
+    for entry in parse_importtime(result.stderr):
+        subtree.append(entry)
+        if entry.depth == 0:
+            if entry.module == module:
+                break
+            subtree = []
+    packages = defaultdict(int)
+    for entry in subtree:
+        # Modules du projet détaillés un par un, dépendances regroupées par paquet
+        parts = entry.module.split('.')
+        packages['.'.join(parts[:2]) if parts[0] == 'src' else parts[0]] += entry.self_us
+    return {
+        'module': module,
+        'total_ms': subtree[-1].cumulative_us / 1000 if subtree else 0.0,
+        'packages': sorted(((name, us / 1000) for name, us in packages.items()), key=lambda p: -p[1]),
+        'loaded': [entry.module for entry in subtree],
+    }
+
+
+def format_report(report: dict, top: int = 10) -> str:
+    lines = [f"{report['module']} : {report['total_ms']:.1f} ms"]
+    for name, ms in report['packages'][:top]:
+        lines.append(f"  {name:<28s} {ms:8.1f} ms")
+    return '\n'.join(lines)
@@ -0,0 +1,24 @@
+import os
+import re
+
+
+def parse_size(value) -> int:
+    """Convertit une taille ('500M', '2G', '1048576') en octets"""
+    if value is None or isinstance(value, int):
+        return value
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*', str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Taille invalide : {value}")
+    factor = 1024 ** ' KMGT'.index(match.group(2).upper() or ' ')
+    return int(float(match.group(1)) * factor)
+
+
+def pid_alive(pid):
+    """Indique si le processus `pid` existe encore sur cette machine"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,86 @@
+import re
+import math
+import logging
+from typing import List, Tuple
+
+_PUNCTUATION = re.compile(r"[^\w']+", re.UNICODE)
+
+# Nombre minimal de mots communs pour considérer un recouvrement comme aligné
+MIN_MATCH_WORDS = 2
+# Mots mal reconnus tolérés à chaque bord (mot coupé par la découpe)
+BOUNDARY_TOLERANCE = 2
+# Débit de parole maximal retenu pour dimensionner la fenêtre de comparaison
+MAX_WORDS_PER_SECOND = 4.0
+
+
+def _normalize(word):
+    return _PUNCTUATION.sub('', word.lower())
+
+
+def overlap_window(overlap_seconds: float) -> int:
+    """Nombre maximal de mots que peut contenir un recouvrement de `overlap_seconds`"""
+    return max(MIN_MATCH_WORDS, math.ceil(overlap_seconds * MAX_WORDS_PER_SECOND))
+
+
+def _anchored_match(tail: List[str], head: List[str], window: int):
+    """Plus long passage commun qui termine `tail` et commence `head`, aux mots tolérés près.
+
+    Retourne (taille, mots ignorés en fin de tail, mots ignorés en début de head) ou None.
+    Chaque mot ignoré exige un mot commun de plus, et le passage ne peut pas couvrir
+    tout un segment : le recouvrement n'en est qu'une partie.
+    """
+    best = None
+    for trim in range(BOUNDARY_TOLERANCE + 1):
+        end = len(tail) - trim
+        for skip in range(BOUNDARY_TOLERANCE + 1):
+            minimum = MIN_MATCH_WORDS + trim + skip
+            for size in range(min(window, end - 1, len(head) - skip - 1), minimum - 1, -1):
+                if tail[end - size:end] == head[skip:skip + size]:
+                    candidate = (size, -(trim + skip), trim, skip)
+                    best = max(best, candidate) if best else candidate
+                    break
+    return (best[0], best[2], best[3]) if best else None
+
+
+def merge_pair(previous: List[str], following: List[str], window: int) -> Tuple[List[str], int]:
+    """Aligne la fin de `previous` sur le début de `following` et retire le doublon.
+
+    Le passage commun doit être ancré aux deux bords (fin de `previous`, début de
+    `following`) et tenir dans `window` mots : un passage répété ailleurs dans le
+    texte n'est jamais pris pour le recouvrement. Retourne (mots fusionnés, mots supprimés).
+    """
+    if not previous or not following:
+        return previous + following, 0
+    span = window + BOUNDARY_TOLERANCE + 1
+    tail_start = max(0, len(previous) - span)
+    tail = [_normalize(w) for w in previous[tail_start:]]
+    head = [_normalize(w) for w in following[:span]]
+    match = _anchored_match(tail, head, window)
+    if match is None:
+        return previous + following, 0
+    size, trim, skip = match
+    # Couper au milieu du passage commun : la fin du segment précédent et le début
+    # du suivant sont les zones les plus souvent tronquées par la découpe
+    cut_a = len(previous) - trim - size + size // 2
+    cut_b = skip + size // 2
+    merged = previous[:cut_a] + following[cut_b:]
+    removed = len(previous) + len(following) - len(merged)
+    return merged, removed
+
+
+def merge_transcripts(texts: List[str], overlap_seconds: float = 2.0) -> Tuple[str, int]:
+    """Fusionne les transcriptions de segments qui se recouvrent de `overlap_seconds`.
+
+    Retourne le texte fusionné et le nombre de mots dupliqués supprimés.
+    """
+    window = overlap_window(overlap_seconds)
+    merged: List[str] = []
+    removed_total = 0
+    for text in texts:
+        words = text.split()
+        if not words:
+            continue
+        merged, removed = merge_pair(merged, words, window)
+        removed_total += removed
+    logging.debug(f"Fusion des segments : {removed_total} mots dupliqués supprimés")
+    return " ".join(merged), removed_total
@@ -0,0 +1,111 @@
+import os
+import queue
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import speech_recognition as sr
+
+
+def default_worker_count() -> int:
+    """Nombre de workers par défaut : AUDIO2TEXT_WORKERS ou nombre de CPU - 1"""
+    env = os.environ.get('AUDIO2TEXT_WORKERS')
+    if env:
+        return max(1, int(env))
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+class SharedExecutor(ThreadPoolExecutor):
+    """Pool de threads dont la taille peut augmenter après sa création"""
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def grow(self, max_workers: int):
+        """Porte la taille à `max_workers` (jamais de réduction) ; les threads sont créés à la demande"""
+        with self._shutdown_lock:
+            self._max_workers = max(self._max_workers, max_workers)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_shared_executor(max_workers: int = None) -> SharedExecutor:
+    """Pool de threads unique du processus, réutilisé par toutes les conversions.
+
+    La taille par défaut est fixée au premier appel ; une taille explicite plus grande
+    demandée ensuite (budget d'un service, `AudioConverter(max_workers=N)`) agrandit le
+    pool. Une taille plus petite n'a pas d'effet : chaque conversion borne elle-même
+    ses segments en vol.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            size = max_workers or default_worker_count()
+            _executor = SharedExecutor(max_workers=size, thread_name_prefix='audio2text-worker')
+            logging.info(f"Pool de workers partagé créé ({size} threads)")
+        elif max_workers and max_workers > _executor.max_workers:
+            logging.info(f"Pool de workers partagé agrandi : {_executor.max_workers} → {max_workers} threads")
+            _executor.grow(max_workers)
+        return _executor
+
+
+def shutdown_shared_executor(wait: bool = True):
+    """Arrête le pool partagé (un nouveau sera créé au prochain appel)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor:
+        executor.shutdown(wait=wait)
+
+
+atexit.register(shutdown_shared_executor, False)
+
+
+class RecognizerPool:
+    """Réserve d'objets sr.Recognizer réutilisés d'un segment et d'un fichier à l'autre"""
+
+    def __init__(self, size: int = None):
+        self.size = size or default_worker_count()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> int:
+        return self._created
+
+    def _new_recognizer(self):
+        recognizer = sr.Recognizer()
+        with self._lock:
+            self._created += 1
+        return recognizer
+
+    @contextmanager
+    def acquire(self):
+        """Emprunte un Recognizer ; il est rendu à la réserve en sortie de contexte"""
+        try:
+            recognizer = self._idle.get_nowait()
+        except queue.Empty:
+            recognizer = self._new_recognizer()
+        try:
+            yield recognizer
+        finally:
+            if self._idle.qsize() < self.size:
+                self._idle.put(recognizer)
+
+
+_recognizer_pool = None
+
+
+def get_recognizer_pool() -> RecognizerPool:
+    """Réserve de Recognizer partagée par le processus"""
+    global _recognizer_pool
+    with _executor_lock:
+        if _recognizer_pool is None:
+            _recognizer_pool = RecognizerPool()
+        return _recognizer_pool
@@ -1,8 +1,14 @@
 import pytest
 import os
+import shutil
 import tempfile
 import wave
 
+@pytest.fixture(autouse=True, scope='session')
+def isolated_data_dir(tmp_path_factory):
+    """Isole les données persistantes (file de jobs) du répertoire utilisateur"""
+    os.environ['AUDIO2TEXT_DATA_DIR'] = str(tmp_path_factory.mktemp('audio2text-data'))
+
 @pytest.fixture
 def test_audio_file():
     """Create a temporary WAV file for testing."""
@@ -24,3 +30,16 @@ def temp_output_dir():
     """Create a temporary directory for output files."""
     with tempfile.TemporaryDirectory() as temp_dir:
         yield temp_dir
+
+@pytest.fixture
+def wav_passthrough(monkeypatch):
+    """Remplace convert_to_wav d'un convertisseur par une copie du WAV d'entrée (sans ffmpeg)."""
+    def fake_convert_to_wav(audio_path, scratch=None):
+        path = scratch.new_file('.wav')
+        shutil.copyfile(audio_path, path)
+        return path
+
+    def patch(converter):
+        monkeypatch.setattr(converter, 'convert_to_wav', fake_convert_to_wav)
+        return converter
+    return patch
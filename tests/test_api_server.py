@@ -0,0 +1,163 @@
+import io
+import os
+import sys
+import wave
+import time
+import random
+import asyncio
+import pytest
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.api_client import parse_events, post_chunked
+from src.api_server import BodyReader, TranscriptionServer
+from src.audio_converter import AudioConverter
+from src.recognizers import OfflineRecognizer
+
+def make_wav(seconds, rate=8000):
+    """WAV mono 16 bits de bruit aléatoire"""
+    rng = random.Random(0)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(bytes(rng.getrandbits(8) for _ in range(seconds * rate * 2)))
+    return buffer.getvalue()
+
+@pytest.fixture
+def server_port():
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        TranscriptionServer(port=0, max_workers=2, recognize_backend=OfflineRecognizer()).start())
+    yield loop, server.port
+    loop.run_until_complete(server.stop())
+    loop.close()
+
+def test_streaming_transcription(server_port):
+    loop, port = server_port
+    response = loop.run_until_complete(post_chunked(port, '/transcribe?language=en-US', make_wav(100)))
+    head, events = parse_events(response)
+    assert head.startswith(b"HTTP/1.1 200")
+    assert b"text/event-stream" in head
+    segments = [payload for event, payload in events if event == 'segment']
+    assert sorted(s['index'] for s in segments) == [1, 2, 3]
+    assert [s['end'] for s in sorted(segments, key=lambda s: s['index'])] == [45.0, 90.0, 100.0]
+    assert all(s['text'].startswith('en') for s in segments)
+    event, done = events[-1]
+    assert event == 'done'
+    assert done['segments'] == 3
+
+def test_invalid_wav_rejected(server_port):
+    loop, port = server_port
+    response = loop.run_until_complete(post_chunked(port, '/transcribe', b'RIFF\x00\x00\x00\x00XXXX'))
+    assert response.startswith(b"HTTP/1.1 400")
+
+def test_unknown_path(server_port):
+    loop, port = server_port
+    response = loop.run_until_complete(post_chunked(port, '/nope', b''))
+    assert response.startswith(b"HTTP/1.1 404")
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Pool qui mesure le nombre maximal de tâches soumises et non terminées"""
+
+    def __init__(self, max_workers):
+        super().__init__(max_workers)
+        self.outstanding = 0
+        self.peak = 0
+
+    def submit(self, *args, **kwargs):
+        self.outstanding += 1
+        self.peak = max(self.peak, self.outstanding)
+        future = super().submit(*args, **kwargs)
+        future.add_done_callback(lambda _: self._done())
+        return future
+
+    def _done(self):
+        self.outstanding -= 1
+
+def test_slow_recognition_pauses_upload():
+    def slow_backend(recognizer, audio, language):
+        time.sleep(0.05)
+        return "mot"
+
+    async def run():
+        server = TranscriptionServer(port=0, max_workers=1, recognize_backend=slow_backend, max_in_flight=2)
+        server.executor = CountingExecutor(1)
+        await server.start()
+        try:
+            # 10 segments de silence : l'upload est bien plus rapide que la reconnaissance
+            buffer = io.BytesIO()
+            with wave.open(buffer, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(8000)
+                wf.writeframes(bytes(450 * 8000 * 2))
+            response = await post_chunked(server.port, '/transcribe', buffer.getvalue())
+        finally:
+            await server.stop()
+            server.executor.shutdown()
+        return server.executor.peak, parse_events(response)[1]
+
+    peak, events = asyncio.run(run())
+    assert events[-1] == ('done', {'segments': 10, 'text': "Mot" + " mot" * 9 + "."})
+    assert peak <= 2
+
+def test_error_after_headers_stays_in_stream(server_port, monkeypatch):
+    def broken_format(self, text):
+        raise RuntimeError("mise en forme impossible")
+
+    monkeypatch.setattr(AudioConverter, 'format_text', broken_format)
+    loop, port = server_port
+    response = loop.run_until_complete(post_chunked(port, '/transcribe?language=en-US', make_wav(50)))
+    head, events = parse_events(response)
+    assert head.startswith(b"HTTP/1.1 200")
+    assert response.count(b"HTTP/1.1") == 1
+    assert events[-1] == ('error', {'status': 500, 'message': "mise en forme impossible"})
+
+class ClosedWriter:
+    """Écrivain dont le client se déconnecte juste après les en-têtes"""
+
+    def __init__(self):
+        self.drains = 0
+
+    def write(self, data):
+        pass
+
+    async def drain(self):
+        self.drains += 1
+        if self.drains > 1:
+            raise ConnectionResetError()
+
+def test_disconnect_cancels_queued_segments():
+    calls = []
+
+    def slow_backend(recognizer, audio, language):
+        calls.append(language)
+        time.sleep(0.1)
+        return "mot"
+
+    async def run():
+        server = TranscriptionServer(max_workers=1, recognize_backend=slow_backend, max_in_flight=10)
+        server.executor = ThreadPoolExecutor(1)
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(8000)
+            wf.writeframes(bytes(450 * 8000 * 2))
+        payload = buffer.getvalue()
+        reader = asyncio.StreamReader()
+        reader.feed_data(payload)
+        reader.feed_eof()
+        body = BodyReader(reader, {'content-length': str(len(payload))})
+        with pytest.raises(ConnectionResetError):
+            await server._transcribe(body, {}, 'fr-FR', ClosedWriter())
+        server.executor.shutdown(wait=True)
+
+    asyncio.run(run())
+    # 10 segments soumis ; seuls ceux déjà démarrés sont reconnus
+    assert len(calls) <= 2
@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+import asyncio
+import shutil
+import threading
+import pytest
+import numpy as np
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import async_converter
+from src.async_converter import SegmentResult, transcribe, transcribe_stream, PCM_RATE
+from src.audio_converter import AudioConverter
+from src.languages import AUTO_LANGUAGE
+from src.recognizers import AsyncOfflineRecognizer, OfflineRecognizer
+
+def tone_pcm(seconds, rate=PCM_RATE, channels=1):
+    t = np.arange(int(seconds * rate)) / rate
+    samples = (8000 * np.sin(2 * np.pi * 440 * t)).astype('<i2')
+    if channels > 1:
+        samples = np.repeat(samples, channels)
+    return samples.tobytes()
+
+async def chunked(data, size=4096):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+        await asyncio.sleep(0)
+
+def make_converter(backend, segment_duration=1):
+    converter = AudioConverter(max_workers=2, recognize_backend=backend)
+    converter.segment_duration = segment_duration
+    return converter
+
+async def collect(agen):
+    return [seg async for seg in agen]
+
+def test_transcribe_stream_yields_every_segment():
+    converter = make_converter(OfflineRecognizer())
+    segments = asyncio.run(collect(transcribe_stream(chunked(tone_pcm(3.5)), converter=converter)))
+    assert sorted(seg.index for seg in segments) == [1, 2, 3, 4]
+    last = max(segments, key=lambda seg: seg.index)
+    assert last.start == pytest.approx(3.0)
+    assert last.end == pytest.approx(3.5)
+    assert all(seg.text for seg in segments)
+
+def test_transcribe_stream_mixes_stereo_to_mono():
+    backend = OfflineRecognizer()
+    mono = asyncio.run(collect(transcribe_stream(chunked(tone_pcm(1)), converter=make_converter(backend))))
+    stereo = asyncio.run(collect(transcribe_stream(chunked(tone_pcm(1, channels=2)), channels=2,
+                                                   converter=make_converter(backend))))
+    assert [seg.text for seg in stereo] == [seg.text for seg in mono]
+
+def test_async_backend_runs_without_threads():
+    backend = AsyncOfflineRecognizer(base_latency=0.2)
+    converter = make_converter(backend)
+    threads_before = threading.active_count()
+
+    async def many():
+        semaphore = asyncio.Semaphore(200)
+        jobs = [collect(transcribe_stream(chunked(tone_pcm(0.5)), converter=converter, semaphore=semaphore))
+                for _ in range(200)]
+        return await asyncio.gather(*jobs)
+
+    start = time.perf_counter()
+    results = asyncio.run(many())
+    elapsed = time.perf_counter() - start
+    assert len(results) == 200 and all(len(r) == 1 for r in results)
+    # 200 requêtes de 0,2 s en parallèle, sans un thread par requête
+    assert elapsed < 5
+    assert threading.active_count() <= threads_before + 1
+    assert backend.calls == 200
+
+def test_semaphore_bounds_segments_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def backend(recognizer, audio, language):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return "ok"
+
+    converter = make_converter(backend, segment_duration=0.1)
+    segments = asyncio.run(collect(transcribe_stream(chunked(tone_pcm(2)), converter=converter,
+                                                     max_concurrency=3)))
+    assert len(segments) == 20
+    assert peak == 3
+
+def test_cancelled_stream_returns_semaphore_permits():
+    converter = make_converter(AsyncOfflineRecognizer(base_latency=0.05))
+
+    async def one_chunk():
+        yield tone_pcm(10)
+
+    async def cancel_before_tasks_start(semaphore):
+        stream = transcribe_stream(one_chunk(), converter=converter, semaphore=semaphore)
+        consumer = asyncio.ensure_future(stream.__anext__())
+        # Un tour de boucle : les segments sont soumis mais leurs tâches n'ont pas démarré
+        await asyncio.sleep(0)
+        consumer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+        await asyncio.sleep(0.01)
+        return semaphore._value
+
+    assert asyncio.run(cancel_before_tasks_start(asyncio.Semaphore(4))) == 4
+
+def test_transcribe_text_ignores_overlap_setting(tmp_path, monkeypatch):
+    converter = make_converter(lambda recognizer, audio, language: "un deux trois")
+    converter.segment_overlap = 2
+
+    async def fake_transcribe(path, language, converter, **kwargs):
+        # Segments contigus : « trois quatre » est prononcé deux fois, pas recouvert
+        for index, text in ((1, "un deux trois quatre"), (2, "trois quatre cinq six")):
+            yield SegmentResult(index, index - 1.0, float(index), text)
+
+    monkeypatch.setattr(async_converter, 'transcribe', fake_transcribe)
+    text = asyncio.run(async_converter.transcribe_text('x.wav', converter=converter))
+    assert text == "Un deux trois quatre trois quatre cinq six."
+
+def test_backend_errors_are_raised():
+    async def backend(recognizer, audio, language):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect(transcribe_stream(chunked(tone_pcm(1)), converter=make_converter(backend))))
+
+def test_auto_language_is_rejected():
+    calls = []
+    converter = make_converter(lambda recognizer, audio, language: calls.append(language) or "mot")
+    with pytest.raises(ValueError, match="Détection automatique"):
+        asyncio.run(collect(transcribe_stream(chunked(tone_pcm(1)), language=AUTO_LANGUAGE, converter=converter)))
+    assert calls == []
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg requis")
+def test_transcribe_file(tmp_path):
+    from pydub import AudioSegment
+    path = tmp_path / 'tone.wav'
+    AudioSegment(tone_pcm(2), frame_rate=PCM_RATE, sample_width=2, channels=1).export(path, format='wav')
+    segments = asyncio.run(collect(transcribe(str(path), converter=make_converter(OfflineRecognizer()))))
+    assert len(segments) == 2
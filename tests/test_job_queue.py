@@ -0,0 +1,170 @@
+import os
+import time
+import sys
+import socket
+import sqlite3
+import pytest
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job_queue import (JobQueue, JobQueueService, QueueFullError, PRIORITY_BULK,
+                           PRIORITY_INTERACTIVE, STATUS_CANCELLED, STATUS_DONE, STATUS_PENDING,
+                           STATUS_FAILED)
+from src import cli
+
+class FakeSignal:
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self, *args):
+        for slot in self.slots:
+            slot(*args)
+
+class FakeConverter:
+    """Convertisseur factice : retourne le nom du fichier sans appel réseau"""
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self.is_running = False
+        self.progress_updated = FakeSignal()
+
+    def convert_to_text(self, audio_path, language, job=None):
+        if 'broken' in audio_path:
+            raise RuntimeError("fichier illisible")
+        self.progress_updated.emit(1, 1)
+        return f"{os.path.basename(audio_path)} ({language})"
+
+@pytest.fixture
+def job_queue(tmp_path):
+    queue = JobQueue(tmp_path / 'jobs.db', max_backlog=3)
+    yield queue
+    queue.close()
+
+def test_claim_follows_priority(job_queue):
+    bulk = job_queue.submit('bulk.wav', priority=PRIORITY_BULK)
+    interactive = job_queue.submit('interactive.wav', priority=PRIORITY_INTERACTIVE)
+    assert job_queue.claim()['id'] == interactive
+    assert job_queue.claim()['id'] == bulk
+    assert job_queue.claim() is None
+
+def test_backlog_is_bounded(job_queue):
+    for i in range(3):
+        job_queue.submit(f'{i}.wav')
+    with pytest.raises(QueueFullError):
+        job_queue.submit('overflow.wav')
+    with pytest.raises(QueueFullError):
+        job_queue.submit('overflow.wav', block=True, timeout=0.1)
+    job_queue.cancel(1)
+    assert job_queue.submit('overflow.wav') == 4
+
+def test_interactive_jobs_bypass_full_backlog(job_queue):
+    for i in range(3):
+        job_queue.submit(f'bulk{i}.wav', priority=PRIORITY_BULK)
+    with pytest.raises(QueueFullError):
+        job_queue.submit('overflow.wav', priority=PRIORITY_BULK)
+    interactive = job_queue.submit('interactive.wav', priority=PRIORITY_INTERACTIVE)
+    assert job_queue.claim()['id'] == interactive
+    # Les jobs interactifs ne réduisent pas la place du traitement de masse
+    job_queue.cancel(1)
+    job_queue.submit('interactive2.wav', priority=PRIORITY_INTERACTIVE)
+    assert job_queue.submit('bulk3.wav', priority=PRIORITY_BULK)
+
+def test_private_service_runs_only_its_jobs(job_queue):
+    bulk = job_queue.submit('bulk.wav', priority=PRIORITY_BULK)
+    service = JobQueueService(job_queue, converter_factory=FakeConverter, poll_interval=0.05,
+                              own_jobs_only=True).start()
+    try:
+        own = service.submit('gui.wav', 'en-US', PRIORITY_INTERACTIVE)
+        assert job_queue.wait_for(own, timeout=5)['status'] == STATUS_DONE
+        time.sleep(0.2)
+    finally:
+        service.stop()
+    assert job_queue.get(bulk)['status'] == STATUS_PENDING
+    # Un worker ordinaire voit tous les jobs
+    assert job_queue.claim()['id'] == bulk
+
+def test_old_database_gains_owner_column(tmp_path):
+    db_path = tmp_path / 'jobs.db'
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, audio_path TEXT NOT NULL, "
+                 "language TEXT NOT NULL, priority INTEGER NOT NULL, status TEXT NOT NULL, output_path TEXT, "
+                 "result TEXT, error TEXT, progress INTEGER NOT NULL DEFAULT 0, "
+                 "attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, created_at REAL NOT NULL, "
+                 "started_at REAL, finished_at REAL)")
+    conn.commit()
+    conn.close()
+    queue = JobQueue(db_path)
+    job_id = queue.submit('a.wav', owner='gui')
+    assert queue.claim(owner='other') is None
+    assert queue.claim() is None
+    assert queue.claim(owner='gui')['id'] == job_id
+    queue.close()
+
+def test_interrupted_jobs_recovered_after_restart(tmp_path):
+    db_path = tmp_path / 'jobs.db'
+    queue = JobQueue(db_path)
+    job_id = queue.submit('a.wav')
+    queue.claim()
+    queue.close()
+    # Simuler un worker disparu (processus tué)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("UPDATE jobs SET worker = ? WHERE id = ?", (f"{os.uname().nodename}:999999999", job_id))
+    conn.commit()
+    conn.close()
+    queue = JobQueue(db_path)
+    assert queue.get(job_id)['status'] == STATUS_PENDING
+    queue.close()
+
+def test_crashed_gui_jobs_are_not_run_by_others(tmp_path):
+    db_path = tmp_path / 'jobs.db'
+    queue = JobQueue(db_path)
+    # Jobs d'une interface graphique dont le processus a disparu (plantage)
+    dead_gui = f"{socket.gethostname()}:999999999"
+    running = queue.submit('en_cours.wav', priority=PRIORITY_INTERACTIVE, owner=dead_gui)
+    queue.claim(owner=dead_gui)
+    waiting = queue.submit('en_attente.wav', priority=PRIORITY_INTERACTIVE, owner=dead_gui)
+    bulk = queue.submit('bulk.wav', priority=PRIORITY_BULK)
+    queue.close()
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("UPDATE jobs SET worker = ? WHERE id = ?", (dead_gui, running))
+    conn.commit()
+    conn.close()
+
+    # Redémarrage de l'interface : nouveau nom de service, les anciens jobs sont abandonnés
+    queue = JobQueue(db_path)
+    assert queue.get(running)['status'] == STATUS_CANCELLED
+    assert queue.get(waiting)['status'] == STATUS_CANCELLED
+    service = JobQueueService(queue, converter_factory=FakeConverter, own_jobs_only=True)
+    assert queue.claim(service.owner) is None
+    # Un worker en ligne de commande ne voit que les jobs non réservés
+    assert queue.claim()['id'] == bulk
+    queue.close()
+
+def test_service_runs_jobs(job_queue, tmp_path):
+    output_path = str(tmp_path / 'out.txt')
+    ok = job_queue.submit('ok.wav', 'en-US', output_path=output_path)
+    broken = job_queue.submit('broken.wav')
+    service = JobQueueService(job_queue, max_concurrent_jobs=2, worker_budget=4,
+                              converter_factory=FakeConverter, poll_interval=0.05).start()
+    try:
+        done = job_queue.wait_for(ok, timeout=5)
+        failed = job_queue.wait_for(broken, timeout=5)
+    finally:
+        service.stop()
+    assert done['status'] == STATUS_DONE
+    assert done['result'] == "ok.wav (en-US)"
+    assert done['progress'] == 100
+    assert open(output_path, encoding='utf-8').read() == "ok.wav (en-US)"
+    assert failed['status'] == STATUS_FAILED
+    assert "illisible" in failed['error']
+
+def test_cli_submit_and_status(tmp_path, capsys):
+    db = str(tmp_path / 'jobs.db')
+    assert cli.main(['--db', db, 'submit', '-p', 'bulk', 'a.wav']) == 0
+    assert capsys.readouterr().out.strip() == '1'
+    assert cli.main(['--db', db, '--max-backlog', '1', 'submit', 'b.wav']) == cli.EXIT_QUEUE_FULL
+    assert cli.main(['--db', db, 'status']) == 0
+    assert 'pending' in capsys.readouterr().out
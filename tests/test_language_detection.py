@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import numpy as np
+import speech_recognition as sr
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.audio_converter import AudioConverter, ConversionJob
+from src.language_detection import LanguageDetector
+from src.languages import AUTO_LANGUAGE
+from src.pcm_buffer import PCMBuffer
+from src.recognizers import _parse_google_response
+
+RATE = 16000
+
+def tone_buffer(seconds, amplitude=6000):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return PCMBuffer((amplitude * np.sin(2 * np.pi * 440 * t)).astype('<i2'), RATE)
+
+class LanguageBackend:
+    """Backend factice : ne comprend que `spoken`, enregistre les langues demandées"""
+
+    def __init__(self, spoken='en-US'):
+        self.spoken = spoken
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, recognizer, audio, language):
+        with self._lock:
+            self.calls.append((language, len(audio.get_raw_data())))
+        if language != self.spoken:
+            raise sr.UnknownValueError()
+        return "hello world"
+
+def run_job(converter, tmp_path, wav_passthrough, language, seconds=3, name='input.wav'):
+    wav_path = str(tmp_path / name)
+    tone_buffer(seconds).to_audio_segment().export(wav_path, format='wav')
+
+    wav_passthrough(converter)
+    return converter.convert_to_text(wav_path, language)
+
+def test_job_language_does_not_mutate_converter(tmp_path, wav_passthrough):
+    backend = LanguageBackend('de-DE')
+    converter = AudioConverter(max_workers=2, recognize_backend=backend)
+    converter.segment_duration = 1
+    assert run_job(converter, tmp_path, wav_passthrough, 'de-DE') == "Hello world hello world hello world."
+    assert converter.language == 'fr-FR'
+    assert {language for language, _ in backend.calls} == {'de-DE'}
+    assert converter.job_stats['language'] == 'de-DE'
+
+def test_concurrent_jobs_keep_their_language():
+    backend = LanguageBackend()
+    converter = AudioConverter(max_workers=4, recognize_backend=backend)
+    results = {}
+
+    def worker(language):
+        results[language] = [converter.process_segment((tone_buffer(0.2), i, 0.0, 0.2), language)[1]
+                             for i in range(20)]
+
+    threads = [threading.Thread(target=worker, args=(language,)) for language in ('en-US', 'fr-FR')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results['en-US'] == ["hello world"] * 20
+    assert results['fr-FR'] == [""] * 20
+
+def test_concurrent_conversions_share_converter(tmp_path, wav_passthrough):
+    def slow_backend(recognizer, audio, language):
+        time.sleep(0.02)
+        return {'de-DE': 'wort', 'en-US': 'word'}[language]
+
+    converter = AudioConverter(max_workers=4, recognize_backend=slow_backend, executor=ThreadPoolExecutor(4))
+    converter.segment_duration = 0.5
+    results = {}
+
+    def job(language, seconds):
+        results[language] = run_job(converter, tmp_path, wav_passthrough, language, seconds, f'{language}.wav')
+
+    threads = [threading.Thread(target=job, args=args) for args in (('de-DE', 10), ('en-US', 1))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # La fin du job court n'interrompt pas le job long
+    assert results['de-DE'] == "Wort" + " wort" * 19 + "."
+    assert results['en-US'] == "Word word."
+
+    assert not converter.is_running
+
+def test_cancel_stops_only_its_conversion(tmp_path, monkeypatch):
+    jobs = {}
+
+    def backend(recognizer, audio, language):
+        if language == 'de-DE':
+            jobs['de-DE'].cancel()
+        return "mot"
+
+    converter = AudioConverter(max_workers=1, recognize_backend=backend, executor=ThreadPoolExecutor(1))
+    converter.segment_duration = 0.5
+    jobs['de-DE'] = ConversionJob()
+    monkeypatch.setattr(converter, 'convert_to_wav', lambda path, scratch=None: path)
+    cancelled = converter.convert_to_text(_tone_file(tmp_path, 'long.wav', 5), 'de-DE', jobs['de-DE'])
+    assert len(cancelled.split()) < 10
+    assert converter.job_stats['cancelled']
+    assert converter.convert_to_text(_tone_file(tmp_path, 'next.wav', 2), 'en-US').split() == ['Mot'] + ['mot'] * 2 + ['mot.']
+    assert not converter.job_stats['cancelled']
+
+def _tone_file(tmp_path, name, seconds):
+    path = str(tmp_path / name)
+    tone_buffer(seconds).to_audio_segment().export(path, format='wav')
+    return path
+
+def test_auto_language_detects_once_and_routes_segments(tmp_path, wav_passthrough):
+    backend = LanguageBackend('es-ES')
+    detector = LanguageDetector(candidates=['fr-FR', 'en-US', 'es-ES'], samples=2, sample_seconds=0.5)
+    converter = AudioConverter(max_workers=2, recognize_backend=backend, language_detector=detector)
+    converter.segment_duration = 1
+    assert run_job(converter, tmp_path, wav_passthrough, AUTO_LANGUAGE) == "Hello world hello world hello world."
+    stats = converter.job_stats
+    assert stats['language'] == 'es-ES'
+    assert stats['language_detection']['requests'] == 6
+    # Extraits courts pour la détection, puis les 3 segments complets dans la langue retenue
+    sample_bytes = int(0.5 * RATE) * 2
+    assert sorted(size for _, size in backend.calls[:6]) == [sample_bytes] * 6
+    assert backend.calls[6:] == [('es-ES', RATE * 2)] * 3
+    assert converter.language == 'fr-FR'
+
+def test_detection_falls_back_to_default_language():
+    converter = AudioConverter(max_workers=1, recognize_backend=LanguageBackend('ja-JP'))
+    detector = LanguageDetector(candidates=['en-US', 'de-DE'], samples=1)
+    result = detector.detect(converter, [(tone_buffer(1), 1, 0.0, 1.0)], fallback='fr-FR')
+    assert result.language == 'fr-FR'
+    assert result.scores == {'en-US': 0.0, 'de-DE': 0.0}
+
+def test_samples_are_loudest_segments():
+    segments = [(tone_buffer(1, amplitude), i + 1, float(i), i + 1.0)
+                for i, amplitude in enumerate([100, 9000, 0, 5000])]
+    samples = LanguageDetector(samples=2, sample_seconds=0.25).pick_samples(segments)
+    assert [round(sample.rms) for sample in samples] == [round(tone_buffer(1, 9000).rms),
+                                                         round(tone_buffer(1, 5000).rms)]
+    assert all(sample.frame_count == RATE // 4 for sample in samples)
+    assert samples[0].shares_memory(segments[1][0])
+
+def test_google_response_confidence():
+    body = '{"result":[]}\n' + json.dumps(
+        {"result": [{"alternative": [{"transcript": "bonjour", "confidence": 0.8}], "final": True}]}) + '\n'
+    assert _parse_google_response(body) == "bonjour"
+    assert _parse_google_response(body, with_confidence=True) == ("bonjour", 0.8)
@@ -0,0 +1,87 @@
+import os
+import sys
+import math
+import wave
+import struct
+import threading
+import time
+import pytest
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import cli
+from src.audio_converter import AudioConverter
+from src.languages import AUTO_LANGUAGE
+from src.live_transcriber import LiveTranscriber, play_wav_realtime
+from src.recognizers import OfflineRecognizer
+
+RATE = 16000
+
+def tone(seconds, amplitude=8000):
+    return b''.join(struct.pack('<h', int(amplitude * math.sin(2 * math.pi * 440 * i / RATE)))
+                    for i in range(int(seconds * RATE)))
+
+def silence(seconds):
+    return b'\x00\x00' * int(seconds * RATE)
+
+@pytest.fixture
+def speech_wav(tmp_path):
+    """Trois « phrases » séparées par des pauses"""
+    path = str(tmp_path / 'speech.wav')
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(tone(0.6) + silence(0.4) + tone(0.6) + silence(0.4) + tone(0.4))
+    return path
+
+@pytest.fixture
+def converter():
+    return AudioConverter(max_workers=2, recognize_backend=OfflineRecognizer(latency_ratio=0.05))
+
+def test_segments_cut_at_pauses(converter):
+    partials = []
+    transcriber = LiveTranscriber(converter, sample_rate=RATE, pause_ms=200, min_segment_s=0.3,
+                                  on_partial=lambda *args: partials.append(args))
+    for chunk in (tone(0.6), silence(0.4), tone(0.6), silence(0.4), tone(0.4)):
+        transcriber.feed(chunk)
+    text = transcriber.close()
+    assert sorted(p[0] for p in partials) == [1, 2, 3]
+    assert text
+
+def test_max_segment_bounds_latency(converter):
+    partials = []
+    transcriber = LiveTranscriber(converter, sample_rate=RATE, max_segment_s=0.5,
+                                  on_partial=lambda *args: partials.append(args))
+    transcriber.feed(tone(1.6))
+    transcriber.close()
+    assert all(end - start <= 0.5 + 1e-6 for _, start, end, _ in partials)
+    assert len(partials) == 4
+
+def test_realtime_pipe(converter, speech_wav):
+    """Le WAV est joué en temps réel dans un pipe ; les résultats arrivent avant la fin du flux"""
+    partials = []
+    read_fd, write_fd = os.pipe()
+    writer = threading.Thread(target=play_wav_realtime, args=(speech_wav, os.fdopen(write_fd, 'wb')))
+    transcriber = LiveTranscriber(converter, pause_ms=200, min_segment_s=0.3,
+                                  on_partial=lambda *args: partials.append((time.monotonic(), args)))
+    start = time.monotonic()
+    writer.start()
+    with os.fdopen(read_fd, 'rb') as stream:
+        text = transcriber.feed_stream(stream)
+    writer.join()
+    stream_end = time.monotonic()
+    assert stream_end - start >= 2.0  # lecture au rythme réel
+    assert len(partials) == 3
+    # Le premier segment est transcrit bien avant la fin du flux
+    assert partials[0][0] < stream_end - 0.5
+    assert max(transcriber.latencies) < 1.0
+    assert text
+
+def test_auto_language_is_rejected(converter, capsys):
+    with pytest.raises(ValueError, match="Détection automatique"):
+        LiveTranscriber(converter, language=AUTO_LANGUAGE)
+    with pytest.raises(SystemExit):
+        cli.main(['live', '-l', AUTO_LANGUAGE, '--offline'])
+    assert "détection automatique" in capsys.readouterr().err
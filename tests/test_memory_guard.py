@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.audio_converter import AudioConverter
+from src.memory_guard import AdaptiveSlots, MemoryGuard
+from src.metrics import ConverterMetrics, MetricsRegistry
+from src.pcm_buffer import PCMBuffer, WavReader, WavWindow
+from src.scheduler import PROBE_MS
+
+RATE = 16000
+MB = 2 ** 20
+
+def noise_wav(path, seconds, channels=1):
+    samples = np.random.default_rng(3).integers(-3000, 3000, (int(seconds * RATE), channels), dtype=np.int16)
+    buffer = PCMBuffer(samples.astype('<i2'), RATE)
+    buffer.to_audio_segment().export(str(path), format='wav')
+    return buffer
+
+def fixed_guard(rss, max_rss=100 * MB):
+    return MemoryGuard(max_rss, read_rss=lambda: rss, metrics=ConverterMetrics(MetricsRegistry()))
+
+class SlowBackend:
+    """Backend factice : note le nombre maximal d'appels simultanés"""
+
+    def __init__(self, delay=0.03, on_call=None):
+        self.delay = delay
+        self.on_call = on_call
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, recognizer, audio, language):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            if self.on_call:
+                self.on_call()
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return "mot"
+
+def run_job(converter, tmp_path, wav_passthrough, seconds):
+    wav_path = tmp_path / 'input.wav'
+    noise_wav(wav_path, seconds)
+
+    wav_passthrough(converter)
+    return converter.convert_to_text(str(wav_path))
+
+def test_guard_scales_concurrency_with_rss():
+    assert fixed_guard(50 * MB).limit(8) == 8
+    assert fixed_guard(90 * MB).limit(8) == 4
+    assert fixed_guard(99 * MB).limit(8) == 1
+    assert fixed_guard(150 * MB).limit(8) == 1
+    assert MemoryGuard(None, read_rss=lambda: 10 ** 12).limit(8) == 8
+
+def test_guard_parses_environment(monkeypatch):
+    monkeypatch.setenv('AUDIO2TEXT_MAX_RSS', '2G')
+    assert MemoryGuard().max_rss == 2 * 1024 ** 3
+
+def test_slots_follow_guard():
+    rss = [150 * MB]
+    guard = MemoryGuard(100 * MB, read_rss=lambda: rss[0], metrics=ConverterMetrics(MetricsRegistry()))
+    slots = AdaptiveSlots(4, guard, recheck=0.01)
+    assert slots.acquire(timeout=0.05)
+    assert not slots.acquire(timeout=0.05)
+    # La mémoire redescend : de nouvelles places sont accordées sans libération
+    rss[0] = 10 * MB
+    assert slots.acquire(timeout=0.05)
+    assert slots.in_use == 2 and slots.lowest_limit == 1
+
+def test_wav_reader_windows_match_split_audio(tmp_path):
+    buffer = noise_wav(tmp_path / 'stereo.wav', 2.3, channels=2)
+    converter = AudioConverter(max_workers=1)
+    converter.segment_duration = 1
+    expected = converter.split_audio(buffer, overlap=0.25)
+    with WavReader(tmp_path / 'stereo.wav') as reader:
+        assert len(reader) == len(buffer)
+        windows = converter.split_audio(reader, overlap=0.25)
+        assert [seg[1:] for seg in windows] == [seg[1:] for seg in expected]
+        for (window, *_), (view, *_) in zip(windows, expected):
+            assert np.array_equal(window.load().samples, view.samples)
+
+def test_decoding_waits_for_recognition(tmp_path, monkeypatch, wav_passthrough):
+    counts = {'read': 0, 'assembled': 0, 'ahead': 0}
+    load = WavWindow.load
+
+    def counting_load(window):
+        # Segments chargés en entier, hors sondes de l'ordonnancement
+        if len(window) > PROBE_MS:
+            counts['read'] += 1
+            counts['ahead'] = max(counts['ahead'], counts['read'] - counts['assembled'])
+        return load(window)
+
+    monkeypatch.setattr(WavWindow, 'load', counting_load)
+    backend = SlowBackend()
+    converter = AudioConverter(max_workers=2, recognize_backend=backend, executor=ThreadPoolExecutor(4),
+                               memory_guard=MemoryGuard(None))
+    converter.progress_updated.connect(lambda done, total: counts.__setitem__('assembled', done))
+    converter.segment_duration = 0.5
+    text = run_job(converter, tmp_path, wav_passthrough, seconds=6)
+    assert text == "Mot" + " mot" * 11 + "."
+    assert counts['read'] == 12
+    # Au plus max_workers segments en vol et un segment lu d'avance
+    assert counts['ahead'] <= 3
+    assert backend.peak <= 2
+
+def test_memory_ceiling_reduces_concurrency(tmp_path, wav_passthrough):
+    backend = SlowBackend()
+    converter = AudioConverter(max_workers=4, recognize_backend=backend, executor=ThreadPoolExecutor(4),
+                               memory_guard=fixed_guard(120 * MB))
+    converter.segment_duration = 0.5
+    assert run_job(converter, tmp_path, wav_passthrough, seconds=3) == "Mot" + " mot" * 5 + "."
+    assert backend.peak == 1
+    assert converter.job_stats['peak_in_flight'] == 1
+    assert converter.job_stats['lowest_concurrency'] == 1
@@ -0,0 +1,65 @@
+import os
+import sys
+import urllib.request
+import pytest
+from pydub import AudioSegment
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.metrics import MetricsRegistry, ConverterMetrics, MetricsServer
+from src.audio_converter import AudioConverter
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+def test_counter_and_gauge_rendering(registry):
+    counter = registry.counter('test_total', "Compteur de test", ['result'])
+    gauge = registry.gauge('test_depth', "Jauge de test")
+    counter.inc(result='success')
+    counter.inc(2, result='error')
+    gauge.set(3)
+    gauge.dec()
+    text = registry.render()
+    assert '# TYPE test_total counter' in text
+    assert 'test_total{result="success"} 1' in text
+    assert 'test_total{result="error"} 2' in text
+    assert 'test_depth 2' in text
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram('test_latency_seconds', "Latence", buckets=(1, 5))
+    histogram.observe(0.5)
+    histogram.observe(3)
+    histogram.observe(10)
+    text = registry.render()
+    assert 'test_latency_seconds_bucket{le="1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="5"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count 3' in text
+
+def test_invalid_labels_rejected(registry):
+    counter = registry.counter('test_total', "Compteur de test", ['result'])
+    with pytest.raises(ValueError):
+        counter.inc(status='x')
+
+def test_metrics_server_scrape(registry):
+    registry.counter('scraped_total', "Compteur exposé").inc()
+    with MetricsServer(registry) as server:
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            body = response.read().decode('utf-8')
+            assert response.headers['Content-Type'].startswith('text/plain')
+    assert 'scraped_total 1' in body
+
+def test_converter_feeds_recognition_metrics(registry):
+    metrics = ConverterMetrics(registry)
+    converter = AudioConverter(max_workers=1, metrics=metrics, recognize_backend=lambda *args: "bonjour")
+
+    metrics.queue_depth.inc()
+    index, text = converter._run_segment((AudioSegment.silent(duration=500), 1, 0.0, 0.5))
+    assert text == "bonjour"
+    assert metrics.recognitions.get(result='success') == 1
+    assert metrics.segment_latency.get_count() == 1
+    assert metrics.queue_depth.get() == 0
+    assert metrics.active_workers.get() == 0
+    assert metrics.temp_disk_bytes.get() == 0
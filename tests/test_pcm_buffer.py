@@ -0,0 +1,70 @@
+import os
+import sys
+import pytest
+import numpy as np
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pcm_buffer import PCMBuffer
+from src.audio_converter import AudioConverter
+
+def sine_buffer(seconds=1.0, rate=16000, freq=440, amplitude=8000, channels=1):
+    t = np.arange(int(seconds * rate)) / rate
+    samples = (amplitude * np.sin(2 * np.pi * freq * t)).astype('<i2')
+    return PCMBuffer(np.repeat(samples[:, None], channels, axis=1), rate)
+
+def test_slicing_is_zero_copy():
+    buffer = sine_buffer(2.0)
+    part = buffer[500:1500]
+    assert part.shares_memory(buffer)
+    assert part.frame_count == 16000
+    assert len(part) == 1000
+    assert buffer.slice_seconds(1.5, 5.0).frame_count == 8000
+
+def test_split_audio_returns_views():
+    converter = AudioConverter(max_workers=1)
+    converter.segment_duration = 1
+    buffer = sine_buffer(3.5)
+    segments = converter.split_audio(buffer)
+    assert [(start, end) for _, _, start, end in segments] == [(0.0, 1.0), (1.0, 2.0), (2.0, 3.0), (3.0, 3.5)]
+    assert all(isinstance(seg, PCMBuffer) and seg.shares_memory(buffer) for seg, _, _, _ in segments)
+
+def test_audio_segment_round_trip():
+    segment = Sine(440).to_audio_segment(duration=300).set_frame_rate(16000).set_sample_width(2)
+    buffer = PCMBuffer.from_audio_segment(segment)
+    assert len(buffer) == len(segment)
+    assert buffer.to_audio_segment().raw_data == segment.raw_data
+    assert buffer.rms == pytest.approx(segment.rms, rel=0.01)
+
+def test_mono_mix_and_resample():
+    stereo = sine_buffer(1.0, channels=2)
+    mono = stereo.to_mono()
+    assert mono.channels == 1
+    assert np.array_equal(mono.samples[:, 0], stereo.samples[:, 0])
+    resampled = mono.resample(8000)
+    assert resampled.frame_rate == 8000
+    assert resampled.frame_count == 8000
+    assert resampled.rms == pytest.approx(mono.rms, rel=0.02)
+
+def test_normalize_reaches_target_level():
+    quiet = sine_buffer(amplitude=300)
+    assert quiet.normalize(-20.0).dbfs == pytest.approx(-20.0, abs=0.2)
+    silent = PCMBuffer(np.zeros(1600, dtype='<i2'), 16000)
+    assert silent.normalize().rms == 0.0
+
+def test_from_bytes_converts_other_widths():
+    eight_bit = bytes([128, 255, 0])
+    assert PCMBuffer.from_bytes(eight_bit, 8000, sample_width=1).samples[:, 0].tolist() == [0, 127 << 8, -32768]
+    value = (-1234 << 8) & 0xFFFFFF
+    pcm24 = value.to_bytes(3, 'little')
+    assert PCMBuffer.from_bytes(pcm24, 8000, sample_width=3).samples[0, 0] == -1234
+
+def test_recognizer_input_without_reencoding():
+    buffer = sine_buffer(0.5, channels=2)
+    audio = buffer.to_audio_data()
+    assert audio.sample_rate == 16000
+    assert audio.sample_width == 2
+    assert audio.get_raw_data() == buffer.to_mono().raw_data
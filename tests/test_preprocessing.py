@@ -0,0 +1,140 @@
+import os
+import sys
+import threading
+import pytest
+import numpy as np
+import speech_recognition as sr
+from concurrent.futures import ThreadPoolExecutor
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.audio_converter import AudioConverter, ConversionJob
+from src.metrics import ConverterMetrics, MetricsRegistry
+from src.pcm_buffer import PCMBuffer
+from src.preprocessing import AudioPreprocessor, high_pass
+
+RATE = 16000
+
+def tone(seconds, amplitude, freq=440.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return amplitude * np.sin(2 * np.pi * freq * t)
+
+def buffer_of(samples):
+    return PCMBuffer(np.rint(samples).astype('<i2'), RATE)
+
+def level_backend(recognizer, audio, language):
+    # Reconnaisseur factice : n'entend rien sous -30 dBFS
+    if PCMBuffer.from_bytes(audio.get_raw_data(), audio.sample_rate).dbfs < -30:
+        raise sr.UnknownValueError()
+    return "bonjour"
+
+@pytest.fixture
+def metrics():
+    return ConverterMetrics(MetricsRegistry())
+
+def test_high_pass_removes_low_frequencies():
+    samples = (tone(1, 0.3, freq=30) + tone(1, 0.3, freq=1000)) / 32768
+    filtered = high_pass(samples.reshape(-1, 1), RATE, 80.0)[:, 0]
+    spectrum = np.abs(np.fft.rfft(filtered))
+    freqs = np.fft.rfftfreq(len(filtered), 1.0 / RATE)
+    assert spectrum[np.argmin(abs(freqs - 30))] < 1e-3 * spectrum[np.argmin(abs(freqs - 1000))]
+
+def test_gate_attenuates_noise_between_words(metrics):
+    noise = np.random.default_rng(0).normal(0, 20, RATE)
+    speech = tone(1, 6000)
+    processed, _ = AudioPreprocessor(metrics=metrics).process(buffer_of(np.concatenate([noise, speech])))
+    out = processed.samples[:, 0].astype(np.float64)
+    noise_rms = np.sqrt(np.mean(out[:RATE // 2] ** 2))
+    speech_rms = np.sqrt(np.mean(out[RATE + 1000:] ** 2))
+    assert speech_rms / noise_rms > 10 ** (60 / 20)
+    # Le niveau de la parole est ramené vers la cible
+    assert 20 * np.log10(speech_rms / 32768) == pytest.approx(-20, abs=1)
+
+def test_quiet_clean_segment_is_kept_and_normalized(metrics):
+    # Signal propre à -53 dBFS : faible, mais loin du silence numérique
+    quiet = buffer_of(tone(1, 32768 * 10 ** (-50 / 20)))
+    assert quiet.dbfs == pytest.approx(-53, abs=0.5)
+    processed, is_quiet = AudioPreprocessor(metrics=metrics).process(quiet)
+    assert processed is not None and is_quiet
+    assert processed.dbfs == pytest.approx(-23, abs=1)
+
+def test_gate_follows_segment_noise_floor(metrics):
+    # Parole faible (-45 dBFS) sur un bruit de fond à -75 dBFS : le gate s'ouvre sur la parole
+    noise = np.random.default_rng(2).normal(0, 32768 * 10 ** (-75 / 20), RATE)
+    speech = tone(1, 32768 * 10 ** (-42 / 20))
+    processed, _ = AudioPreprocessor(metrics=metrics).process(buffer_of(np.concatenate([noise, speech])))
+    out = processed.samples[:, 0].astype(np.float64)
+    assert np.sqrt(np.mean(out[RATE + 1000:] ** 2)) > 100 * np.sqrt(np.mean(out[:RATE // 2] ** 2))
+
+def test_silent_segment_is_not_sent(metrics):
+    calls = []
+    converter = AudioConverter(max_workers=1, metrics=metrics, preprocessor=AudioPreprocessor(metrics=metrics),
+                               recognize_backend=lambda *args: calls.append(args) or "texte")
+    silence = buffer_of(np.random.default_rng(1).normal(0, 3, RATE))
+    assert converter.process_segment((silence, 1, 0.0, 1.0)) == (1, "")
+    assert calls == []
+    assert converter.preprocessor.summary()['skipped_silent'] == 1
+    assert metrics.recognitions.get(result='skipped_silent') == 1
+
+def test_quiet_segment_is_rescued(metrics):
+    preprocessor = AudioPreprocessor(verify_raw=True, metrics=metrics)
+    converter = AudioConverter(max_workers=1, metrics=metrics, preprocessor=preprocessor,
+                               recognize_backend=level_backend)
+    quiet = buffer_of(tone(1, 300))
+    assert AudioConverter(max_workers=1, metrics=metrics,
+                          recognize_backend=level_backend).process_segment((quiet, 1, 0.0, 1.0)) == (1, "")
+    assert converter.process_segment((quiet, 1, 0.0, 1.0)) == (1, "bonjour")
+    # Un segment déjà audible n'est pas compté comme sauvé
+    assert converter.process_segment((buffer_of(tone(1, 8000)), 2, 1.0, 2.0)) == (2, "bonjour")
+    stats = preprocessor.summary()
+    assert stats['rescued'] == 1
+    assert stats['quiet'] == 1
+    assert metrics.preprocess_segments.get(outcome='rescued') == 1
+
+def test_job_stats_report_preprocessing_cost(tmp_path, wav_passthrough, metrics):
+    wav_path = str(tmp_path / 'input.wav')
+    buffer_of(np.concatenate([tone(2, 300), np.zeros(RATE)])).to_audio_segment().export(wav_path, format='wav')
+
+    converter = AudioConverter(max_workers=2, metrics=metrics, recognize_backend=level_backend,
+                               preprocessor=AudioPreprocessor(metrics=metrics))
+    converter.segment_duration = 1
+    wav_passthrough(converter)
+    assert converter.convert_to_text(wav_path) == "Bonjour bonjour."
+    stats = converter.job_stats['preprocess']
+    assert stats['segments'] == 3
+    assert stats['skipped_silent'] == 1
+    assert stats['rescued'] == 2
+    assert stats['ms_per_segment'] > 0
+
+def test_concurrent_jobs_keep_their_preprocessing_stats(tmp_path, wav_passthrough, metrics):
+    first_started, release = threading.Event(), threading.Event()
+
+    def backend(recognizer, audio, language):
+        if language == 'de-DE':
+            first_started.set()
+            release.wait(5)
+        return level_backend(recognizer, audio, language)
+
+    first_path, second_path = str(tmp_path / 'first.wav'), str(tmp_path / 'second.wav')
+    buffer_of(tone(2, 300)).to_audio_segment().export(first_path, format='wav')
+    buffer_of(np.concatenate([tone(1, 300), np.zeros(RATE)])).to_audio_segment().export(second_path, format='wav')
+    converter = AudioConverter(max_workers=4, metrics=metrics, recognize_backend=backend,
+                               executor=ThreadPoolExecutor(4), preprocessor=AudioPreprocessor(metrics=metrics))
+    converter.segment_duration = 1
+    wav_passthrough(converter)
+    first, second = ConversionJob(), ConversionJob()
+    thread = threading.Thread(target=converter.convert_to_text, args=(first_path, 'de-DE', first))
+    thread.start()
+    try:
+        assert first_started.wait(5)
+        # Le second job se termine pendant que le premier attend la reconnaissance
+        converter.convert_to_text(second_path, 'fr-FR', second)
+    finally:
+        release.set()
+        thread.join()
+    assert {key: first.stats['preprocess'][key] for key in ('segments', 'skipped_silent', 'rescued')} == \
+        {'segments': 2, 'skipped_silent': 0, 'rescued': 2}
+    assert {key: second.stats['preprocess'][key] for key in ('segments', 'skipped_silent', 'rescued')} == \
+        {'segments': 2, 'skipped_silent': 1, 'rescued': 1}
+    assert converter.preprocessor.summary()['segments'] == 4
@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import pytest
+import numpy as np
+import speech_recognition as sr
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.audio_converter import AudioConverter
+from src.pcm_buffer import PCMBuffer
+from src.replay import Recording, RecordingBackend, ReplayBackend
+
+RATE = 16000
+
+LOG = """\
+2024-12-21 09:41:19,226 - INFO - Segment créé: 0.0s - 1.0s
+2024-12-21 09:41:19,226 - INFO - Segment créé: 1.0s - 2.0s
+2024-12-21 09:41:19,227 - INFO - Segment créé: 2.0s - 2.5s
+2024-12-21 09:41:19,232 - DEBUG - Segment 1/3: Tentative 1 de reconnaissance
+2024-12-21 09:41:19,232 - DEBUG - Segment 2/3: Tentative 1 de reconnaissance
+2024-12-21 09:41:19,232 - DEBUG - Segment 3/3: Tentative 1 de reconnaissance
+2024-12-21 09:41:19,282 - DEBUG - Segment 3/3: Audio incompréhensible
+2024-12-21 09:41:19,332 - DEBUG - Segment 2/3: Reconnaissance réussie (20 caractères)
+2024-12-21 09:41:19,532 - DEBUG - [audio_converter.py:59] - Segment 1/3: Reconnaissance réussie (30 caractères)
+"""
+
+def noise(seconds, seed):
+    return PCMBuffer(np.random.default_rng(seed).integers(-3000, 3000, int(seconds * RATE)).astype('<i2'), RATE)
+
+def slow_backend(recognizer, audio, language):
+    duration = len(audio.get_raw_data()) / (2 * audio.sample_rate)
+    time.sleep(duration / 20)
+    if duration < 0.3:
+        raise sr.UnknownValueError()
+    return f"texte de {duration:.1f} secondes"
+
+def test_record_then_replay(tmp_path):
+    recorder = RecordingBackend(slow_backend, path=tmp_path / 'run.jsonl')
+    converter = AudioConverter(max_workers=1, recognize_backend=recorder)
+    segments = [(noise(seconds, i), i + 1, 0.0, seconds) for i, seconds in enumerate([1.0, 2.0, 0.2])]
+    expected = [converter.process_segment(segment)[1] for segment in segments]
+    recorder.save()
+
+    recording = Recording.load(tmp_path / 'run.jsonl')
+    assert [r['outcome'] for r in recording.records] == ['success', 'success', 'unknown_value']
+    assert recording.records[1]['latency'] >= 0.1
+    replay = ReplayBackend(recording)
+    converter = AudioConverter(max_workers=1, recognize_backend=replay)
+    start = time.perf_counter()
+    assert [converter.process_segment(segment)[1] for segment in segments] == expected
+    assert time.perf_counter() - start >= 0.15
+    assert (replay.hits, replay.misses) == (3, 0)
+
+def test_unknown_segment_uses_similar_recording():
+    recording = Recording([
+        {'hash': 'a', 'language': 'fr-FR', 'duration': 1.0, 'latency': 0.01, 'outcome': 'success', 'text': 'court'},
+        {'hash': 'b', 'language': 'fr-FR', 'duration': 10.0, 'latency': 0.01, 'outcome': 'success', 'text': 'long'},
+    ])
+    replay = ReplayBackend(recording, speed=100)
+    audio = noise(9.0, 42).to_audio_data()
+    first = replay(sr.Recognizer(), audio, 'fr-FR')
+    assert first == replay(sr.Recognizer(), audio, 'fr-FR')
+    assert replay.misses == 2
+
+def test_log_timing_pattern_is_reproduced(tmp_path, wav_passthrough):
+    log_path = tmp_path / 'audio2text.log'
+    log_path.write_text(LOG, encoding='utf-8')
+    recording = Recording.from_log(log_path)
+    assert [round(r['latency'], 3) for r in recording.records] == [0.3, 0.1, 0.05]
+    assert [len(r['text']) for r in recording.records] == [30, 20, 0]
+
+    wav_path = str(tmp_path / 'synthetique.wav')
+    recording.synthetic_audio().to_audio_segment().export(wav_path, format='wav')
+
+    replay = ReplayBackend(recording)
+    converter = AudioConverter(max_workers=3, recognize_backend=replay)
+    converter.segment_duration = 1
+    wav_passthrough(converter)
+    finished = []
+    converter.segment_completed.connect(finished.append)
+    converter.convert_to_text(wav_path)
+    assert (replay.hits, replay.misses) == (3, 0)
+    # Les segments se terminent dans le même ordre que dans le journal
+    assert finished == ["Segment 3 traité", "Segment 2 traité", "Segment 1 traité"]
+
+def test_invalid_recording_file(tmp_path):
+    path = tmp_path / 'autre.jsonl'
+    path.write_text('{"format": "autre"}\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        Recording.load(path)
@@ -0,0 +1,59 @@
+import os
+import sys
+import wave
+import pytest
+import numpy as np
+from pydub import AudioSegment
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.audio_converter import AudioConverter
+from src.pcm_buffer import PCMBuffer, WavReader
+from src.scheduler import schedule_segments, speech_ratio, straggler_tail
+
+def test_longest_segments_first():
+    segments = [(AudioSegment.empty(), i + 1, start, end)
+                for i, (start, end) in enumerate([(0, 10), (10, 55), (55, 57), (57, 87)])]
+    ordered = schedule_segments(segments)
+    assert [seg[1] for seg in ordered] == [2, 4, 1, 3]
+
+def test_equal_segments_keep_chronological_order():
+    segments = [(AudioSegment.empty(), i + 1, i * 45, (i + 1) * 45) for i in range(4)]
+    segments.append((AudioSegment.empty(), 5, 180, 190))
+    assert [seg[1] for seg in schedule_segments(segments)] == [1, 2, 3, 4, 5]
+
+def speech(seconds, voiced_seconds, rate=8000):
+    """Parole (sinusoïde) sur les `voiced_seconds` premières secondes, silence ensuite"""
+    t = np.arange(int(seconds * rate)) / rate
+    samples = np.where(t < voiced_seconds, 8000 * np.sin(2 * np.pi * 440 * t), 0)
+    return samples.astype('<i2')
+
+def test_speech_ratio():
+    assert speech_ratio(PCMBuffer(speech(4, 0), 8000)) == 0.0
+    assert speech_ratio(PCMBuffer(speech(4, 1), 8000)) == pytest.approx(0.25)
+    assert speech_ratio(PCMBuffer(speech(4, 4), 8000)) == 1.0
+
+def test_equal_segments_ordered_by_speech():
+    # Segments de même durée : l'ordre par durée serait l'ordre chronologique
+    buffer = PCMBuffer(np.concatenate([speech(10, 0), speech(10, 5), speech(10, 10), speech(10, 2)]), 8000)
+    segments = [(buffer[i * 10000:(i + 1) * 10000], i + 1, i * 10.0, (i + 1) * 10.0) for i in range(4)]
+    assert [seg[1] for seg in schedule_segments(segments)] == [3, 2, 4, 1]
+
+def test_wav_windows_ordered_by_speech(tmp_path):
+    path = tmp_path / 'input.wav'
+    with wave.open(str(path), 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(8000)
+        wf.writeframes(np.concatenate([speech(3, 0), speech(3, 1), speech(3, 3)]).tobytes())
+    converter = AudioConverter()
+    converter.segment_duration = 3
+    with WavReader(path) as reader:
+        segments = converter.split_audio(reader)
+        assert [seg[1] for seg in schedule_segments(segments)] == [3, 2, 1]
+
+def test_straggler_tail():
+    # 4 segments, 2 workers : un worker est inactif dès la 3e fin de segment
+    assert straggler_tail([1.0, 2.0, 3.0, 8.0], workers=2) == pytest.approx(5.0)
+    assert straggler_tail([], workers=2) == 0.0
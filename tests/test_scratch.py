@@ -0,0 +1,77 @@
+import os
+import sys
+import pytest
+from pydub import AudioSegment
+import speech_recognition as sr
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scratch import ScratchManager, ScratchQuotaExceeded, ENTRY_PREFIX
+from src.system_utils import parse_size
+from src.audio_converter import AudioConverter
+
+@pytest.fixture
+def scratch(tmp_path):
+    return ScratchManager(tmp_path / 'scratch', quota_bytes=100_000)
+
+def test_parse_size():
+    assert parse_size('512') == 512
+    assert parse_size('2K') == 2048
+    assert parse_size('1.5G') == int(1.5 * 1024 ** 3)
+    assert parse_size(None) is None
+    with pytest.raises(ValueError):
+        parse_size('beaucoup')
+
+def test_job_directory_removed_on_error(scratch):
+    with pytest.raises(RuntimeError):
+        with scratch.job() as job:
+            path = job.new_file('.wav')
+            with open(path, 'wb') as f:
+                f.write(b'\x00' * 1000)
+            job.account(path)
+            assert scratch.usage == 1000
+            raise RuntimeError("échec du job")
+    assert list(scratch.root.iterdir()) == []
+    assert scratch.usage == 0
+
+def test_quota_enforced(scratch):
+    with scratch.job() as job:
+        path = job.new_file('.wav')
+        job.reserve(path, 60_000)
+        other = job.new_file('.wav')
+        with pytest.raises(ScratchQuotaExceeded):
+            job.reserve(other, 60_000)
+        job.release(path)
+        job.reserve(other, 60_000)
+
+def test_orphans_swept_at_startup(tmp_path):
+    root = tmp_path / 'scratch'
+    root.mkdir()
+    orphan_dir = root / f'{ENTRY_PREFIX}999999999-job-dead'
+    orphan_dir.mkdir()
+    (orphan_dir / 'segment.wav').write_bytes(b'\x00')
+    (root / f'{ENTRY_PREFIX}999999999-file-dead.wav').write_bytes(b'\x00')
+    alive = root / f'{ENTRY_PREFIX}{os.getpid()}-job-alive'
+    alive.mkdir()
+    unrelated = root / 'autre.txt'
+    unrelated.write_text('x')
+    ScratchManager(root)
+    assert sorted(p.name for p in root.iterdir()) == sorted([alive.name, unrelated.name])
+
+def test_segment_temp_file_cleaned_on_error(scratch):
+    def fail(recognizer, audio, language):
+        raise sr.RequestError("réseau indisponible")
+    converter = AudioConverter(max_workers=1, recognize_backend=fail, scratch=scratch)
+    index, text = converter.process_segment((AudioSegment.silent(duration=500), 1, 0.0, 0.5))
+    assert text == ""
+    assert list(scratch.root.iterdir()) == []
+    assert scratch.usage == 0
+
+def test_segments_do_not_use_scratch_space(tmp_path):
+    # Les segments sont reconnus en mémoire : un budget minuscule ne les bloque pas
+    scratch = ScratchManager(tmp_path / 'scratch', quota_bytes=1000)
+    converter = AudioConverter(max_workers=1, recognize_backend=lambda *args: "ok", scratch=scratch)
+    assert converter.process_segment((AudioSegment.silent(duration=1000), 1, 0.0, 1.0)) == (1, "ok")
+    assert list(scratch.root.iterdir()) == []
+    assert scratch.usage == 0
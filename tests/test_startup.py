@@ -0,0 +1,72 @@
+import os
+import sys
+import subprocess
+
+# Ajouter le répertoire racine au PYTHONPATH
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from src.startup import import_report, parse_importtime
+from src.signals import Signal, SignalDescriptor
+
+
+def _loaded_modules(code):
+    """Modules chargés après l'exécution de `code` dans un interpréteur neuf"""
+    result = subprocess.run([sys.executable, '-c', code + '\nimport sys\nprint(" ".join(sys.modules))'],
+                            cwd=ROOT, capture_output=True, text=True, check=True,
+                            env={**os.environ, 'QT_QPA_PLATFORM': 'offscreen'})
+    return set(result.stdout.split())
+
+
+def test_converter_does_not_load_qt():
+    loaded = _loaded_modules("import src.cli\nfrom src.audio_converter import AudioConverter\nAudioConverter()")
+    assert not any(name.startswith('PyQt6') for name in loaded)
+
+
+def test_main_window_defers_audio_stack():
+    loaded = _loaded_modules("import src.main_window")
+    for heavy in ('pydub', 'docx', 'speech_recognition', 'numpy'):
+        assert heavy not in loaded
+
+
+def test_parse_importtime():
+    output = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |     _io\n"
+              "import time:      2000 |       2120 |   src.pcm_buffer\n"
+              "import time:       300 |       2420 | src.audio_converter\n")
+    entries = parse_importtime(output)
+    assert [e.module for e in entries] == ['_io', 'src.pcm_buffer', 'src.audio_converter']
+    assert [e.depth for e in entries] == [2, 1, 0]
+    assert entries[-1].cumulative_us == 2420
+
+
+def test_import_report_groups_packages():
+    report = import_report('src.pcm_buffer')
+    names = [name for name, _ in report['packages']]
+    assert report['total_ms'] > 0
+    assert 'numpy' in names and 'src.pcm_buffer' in names
+    assert not any(name.startswith('numpy.') for name in names)
+
+
+def test_signal_descriptor_is_per_instance():
+    class Emitter:
+        changed = SignalDescriptor(int)
+
+    first, second = Emitter(), Emitter()
+    received = []
+    first.changed.connect(received.append)
+    first.changed.emit(1)
+    second.changed.emit(2)
+    assert received == [1]
+    first.changed.disconnect(received.append)
+    first.changed.emit(3)
+    assert received == [1]
+
+
+def test_signal_survives_failing_slot():
+    signal = Signal()
+    received = []
+    signal.connect(lambda value: 1 / 0)
+    signal.connect(received.append)
+    signal.emit('ok')
+    assert received == ['ok']
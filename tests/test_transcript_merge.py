@@ -0,0 +1,80 @@
+import os
+import sys
+import pytest
+from pydub import AudioSegment
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.transcript_merge import merge_pair, merge_transcripts
+from src.audio_converter import AudioConverter
+
+def test_merge_removes_duplicated_overlap():
+    text, removed = merge_transcripts(["le budget a dérivé pour telle raison",
+                                       "pour telle raison des drivers techniques"])
+    assert text == "le budget a dérivé pour telle raison des drivers techniques"
+    assert removed == 3
+
+def test_merge_tolerates_garbled_boundary_word():
+    # Le mot coupé en fin de segment est remplacé par la version du segment suivant
+    text, _ = merge_transcripts(["on avait ce budget là on a fait ç",
+                                 "budget là on a fait ça ça a dérivé"])
+    assert text == "on avait ce budget là on a fait ça ça a dérivé"
+
+def test_merge_without_common_words_concatenates():
+    merged, removed = merge_pair("bonjour à tous".split(), "merci beaucoup".split(), window=10)
+    assert merged == "bonjour à tous merci beaucoup".split()
+    assert removed == 0
+
+def test_merge_ignores_repeated_words_away_from_boundary():
+    previous = ("nous avons parlé de la situation financière du trimestre et des objectifs "
+                "pour la fin de l année")
+    following = "pour l année prochaine nous reviendrons sur le budget et de la situation commerciale"
+    text, removed = merge_transcripts([previous, following])
+    assert text == previous + " " + following
+    assert removed == 0
+
+def test_merge_window_follows_overlap():
+    # Passage commun de 7 mots : plus long que ce que contient 1 s de recouvrement
+    previous, following = "a b c d e f g h", "b c d e f g h i j"
+    assert merge_transcripts([previous, following], overlap_seconds=1)[1] == 0
+    assert merge_transcripts([previous, following], overlap_seconds=2)[0] == "a b c d e f g h i j"
+
+def test_merge_never_swallows_whole_segment():
+    text, removed = merge_transcripts(["un deux trois"] * 3)
+    assert text == "un deux trois un deux trois un deux trois"
+    assert removed == 0
+
+def test_merge_skips_empty_segments():
+    text, removed = merge_transcripts(["un deux trois", "", "trois quatre"])
+    assert text == "un deux trois trois quatre"
+    assert removed == 0
+
+def test_split_audio_with_overlap():
+    converter = AudioConverter()
+    converter.segment_duration = 10
+    segments = converter.split_audio(AudioSegment.silent(duration=25000), overlap=2)
+    assert [(start, end) for _, _, start, end in segments] == [(0.0, 12.0), (10.0, 22.0), (20.0, 25.0)]
+    assert len(segments[0][0]) == 12000
+
+def test_split_audio_overlap_reaching_end_adds_no_segment():
+    converter = AudioConverter()
+    converter.segment_duration = 10
+    segments = converter.split_audio(AudioSegment.silent(duration=21000), overlap=2)
+    assert [(start, end) for _, _, start, end in segments] == [(0.0, 12.0), (10.0, 21.0)]
+
+def test_convert_to_text_reports_overlap_cost(tmp_path, wav_passthrough):
+    wav_path = str(tmp_path / 'input.wav')
+    AudioSegment.silent(duration=25000).export(wav_path, format='wav')
+
+    converter = AudioConverter(max_workers=2, recognize_backend=lambda *args: "un deux trois")
+    converter.segment_duration = 10
+    converter.segment_overlap = 2
+    wav_passthrough(converter)
+    converter.convert_to_text(wav_path)
+    stats = converter.job_stats
+    assert stats['segments'] == 3
+    assert stats['overlap_seconds'] == pytest.approx(4.0)
+    assert stats['overlap_cost_ratio'] == pytest.approx(4.0 / 25)
+    # Segments identiques : aucun recouvrement ancré, rien n'est supprimé
+    assert stats['duplicate_words_removed'] == 0
@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import threading
+import time
+import pytest
+import speech_recognition as sr
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pydub import AudioSegment
+
+# Ajouter le répertoire racine au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.worker_pool import RecognizerPool, get_shared_executor, shutdown_shared_executor
+from src.recognizers import GoogleKeepAliveBackend
+from src.audio_converter import AudioConverter
+
+class FakeSpeechHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+    requests = 0
+    delay = 0.0
+    # Fermer la connexion après la réponse sans l'annoncer (keep-alive expiré côté serveur)
+    drop_connection = False
+
+    def do_POST(self):
+        FakeSpeechHandler.connections.add(self.client_address)
+        FakeSpeechHandler.requests += 1
+        self.rfile.read(int(self.headers['Content-Length']))
+        time.sleep(self.delay)
+        self.close_connection = self.drop_connection
+        body = ('{"result":[]}\n' + json.dumps(
+            {"result": [{"alternative": [{"transcript": "bonjour", "confidence": 0.9}], "final": True}]})
+            + '\n').encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def speech_server():
+    FakeSpeechHandler.connections = set()
+    FakeSpeechHandler.requests = 0
+    FakeSpeechHandler.delay = 0.0
+    FakeSpeechHandler.drop_connection = False
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeSpeechHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_shared_executor_is_reused():
+    assert get_shared_executor() is get_shared_executor()
+    assert AudioConverter().executor is None  # le pool partagé est utilisé à la conversion
+
+def test_shared_executor_grows_for_larger_request():
+    shutdown_shared_executor()
+    executor = get_shared_executor(1)
+    assert get_shared_executor(2) is executor and executor.max_workers == 2
+    assert get_shared_executor(1).max_workers == 2
+    # Toutes les tâches doivent être en vol en même temps pour franchir la barrière
+    barrier = threading.Barrier(2, timeout=5)
+    futures = [executor.submit(barrier.wait) for _ in range(2)]
+    assert sorted(f.result() for f in futures) == [0, 1]
+    shutdown_shared_executor()
+
+def test_recognizer_pool_reuses_instances():
+    pool = RecognizerPool(size=2)
+    with pool.acquire() as first:
+        pass
+    with pool.acquire() as second:
+        assert second is first
+    assert pool.created == 1
+
+def test_segments_reuse_pooled_recognizer():
+    pool = RecognizerPool(size=1)
+    seen = []
+    converter = AudioConverter(recognizer_pool=pool,
+                               recognize_backend=lambda recognizer, audio, language: seen.append(recognizer) or "ok")
+    for i in range(3):
+        converter.process_segment((AudioSegment.silent(duration=200), i + 1, 0.0, 0.2))
+    assert pool.created == 1
+    assert len(set(map(id, seen))) == 1
+
+def test_keepalive_backend_reuses_connection(speech_server):
+    backend = GoogleKeepAliveBackend(host=speech_server, timeout=5)
+    audio = sr.AudioData(b'\x00\x01' * 8000, 16000, 2)
+    texts = [backend(sr.Recognizer(), audio, 'fr-FR') for _ in range(3)]
+    assert texts == ['bonjour'] * 3
+    assert backend.connections_opened == 1
+    assert len(FakeSpeechHandler.connections) == 1
+
+def test_keepalive_backend_reports_connection_failure():
+    backend = GoogleKeepAliveBackend(host='127.0.0.1:1', timeout=1)
+    with pytest.raises(sr.RequestError):
+        backend(sr.Recognizer(), sr.AudioData(b'\x00\x01' * 800, 16000, 2), 'fr-FR')
+
+def test_keepalive_backend_retries_stale_connection(speech_server):
+    FakeSpeechHandler.drop_connection = True
+    backend = GoogleKeepAliveBackend(host=speech_server, timeout=5)
+    audio = sr.AudioData(b'\x00\x01' * 8000, 16000, 2)
+    assert [backend(sr.Recognizer(), audio, 'fr-FR') for _ in range(2)] == ['bonjour'] * 2
+    assert backend.connections_opened == 2
+    assert FakeSpeechHandler.requests == 2
+
+def test_keepalive_backend_does_not_resend_after_timeout(speech_server):
+    FakeSpeechHandler.delay = 1.0
+    backend = GoogleKeepAliveBackend(host=speech_server, timeout=0.2)
+    audio = sr.AudioData(b'\x00\x01' * 8000, 16000, 2)
+    with pytest.raises(sr.RequestError):
+        backend(sr.Recognizer(), audio, 'fr-FR')
+    time.sleep(0.3)
+    assert FakeSpeechHandler.requests == 1